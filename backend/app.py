@@ -1,13 +1,28 @@
 """Flask application factory."""
-from flask import Flask, jsonify
+import importlib
+import uuid
+from flask import Flask, jsonify, request
 from flask_migrate import Migrate
 from flask_cors import CORS
-from sqlalchemy.exc import OperationalError, IntegrityError, DatabaseError
+from sqlalchemy.exc import OperationalError, IntegrityError, DatabaseError, SQLAlchemyError
 from config import config
-from extensions import db, jwt
+from extensions import db, jwt, cache, compress
+from utils.json_provider import OrjsonProvider
+from utils.revocation_cache import is_token_revoked
 
 migrate = Migrate()
 
+# (module, blueprint attribute, URL prefix) registered by create_app. Modules
+# are imported inside the factory so importing app.py stays cheap.
+BLUEPRINTS = (
+    ('routes.health', 'health_bp', '/api'),
+    ('routes.auth', 'auth_bp', '/api/auth'),
+    ('routes.logs', 'logs_bp', '/api/logs'),
+    ('routes.anomalies', 'anomalies_bp', '/api/anomalies'),
+    ('routes.dashboard', 'dashboard_bp', '/api/dashboard'),
+    ('routes.ai', 'ai_bp', '/api/ai'),
+)
+
 
 def create_app(config_name=None, test_config=None):
     """Create and configure Flask application."""
@@ -20,15 +35,30 @@ def create_app(config_name=None, test_config=None):
     else:
         config_name = config_name or 'default'
         app.config.from_object(config[config_name])
+        # Lets worker processes build an app with the same configuration
+        app.config['CONFIG_NAME'] = config_name
+    
+    app.json = OrjsonProvider(app)
     
     # Initialize extensions
+    app.config.setdefault('CACHE_TYPE', 'SimpleCache')
+    app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+    app.config.setdefault('COMPRESS_MIN_SIZE', 512)
     db.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
+    compress.init_app(app)
     migrate.init_app(app, db)
     
+    @jwt.token_in_blocklist_loader
+    def _check_token_version(jwt_header, jwt_payload):
+        """Reject tokens issued before the user's last logout."""
+        return is_token_revoked(jwt_payload)
+    
     # Configure CORS
     # In development, allow all localhost origins
     # In production, this should be restricted to specific domains
+    # max_age lets browsers cache preflight responses (Chromium caps it at 7200s)
     if app.config.get('DEBUG', False):
         CORS(app, resources={
             r"/api/*": {
@@ -40,9 +70,9 @@ def create_app(config_name=None, test_config=None):
                 ],
                 "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
                 "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-                "expose_headers": ["Content-Type"],
+                "expose_headers": ["Content-Type", "Content-Encoding"],
                 "supports_credentials": True,
-                "max_age": 3600
+                "max_age": app.config.get('CORS_MAX_AGE', 7200)
             }
         })
     else:
@@ -52,13 +82,36 @@ def create_app(config_name=None, test_config=None):
                 "origins": app.config.get('CORS_ORIGINS', []),
                 "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
                 "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-                "expose_headers": ["Content-Type"],
+                "expose_headers": ["Content-Type", "Content-Encoding"],
                 "supports_credentials": True,
-                "max_age": 3600
+                "max_age": app.config.get('CORS_MAX_AGE', 7200)
             }
         })
     
-    # Register error handlers
+    @app.before_request
+    def _fast_preflight():
+        """Answer CORS preflights before view dispatch; Flask-CORS adds headers after."""
+        if request.method == 'OPTIONS' and request.routing_exception is None:
+            response = app.make_default_options_response()
+            response.status_code = 204
+            return response
+    
+    register_error_handlers(app)
+    
+    # Register blueprints
+    for module_name, blueprint_name, url_prefix in BLUEPRINTS:
+        module = importlib.import_module(module_name)
+        app.register_blueprint(getattr(module, blueprint_name), url_prefix=url_prefix)
+    
+    if app.config.get('SQLALCHEMY_WARM_STATEMENT_CACHE'):
+        with app.app_context():
+            _warm_statement_cache(app)
+    
+    return app
+
+
+def register_error_handlers(app):
+    """Return database errors as JSON instead of HTML error pages."""
     @app.errorhandler(OperationalError)
     def handle_operational_error(error):
         """Handle database operational errors."""
@@ -88,21 +141,33 @@ def create_app(config_name=None, test_config=None):
             'message': str(error.orig) if hasattr(error, 'orig') else str(error),
             'error_code': 'DB_ERROR'
         }), 500
+
+
+def _warm_statement_cache(app):
+    """
+    Run the hottest queries once against a random ID so their compiled SQL is
+    in the engine's statement cache before the first request arrives.
     
-    # Register blueprints
-    from routes.auth import auth_bp
-    from routes.logs import logs_bp
-    from routes.anomalies import anomalies_bp
-    from routes.dashboard import dashboard_bp
-    from routes.ai import ai_bp
-    from routes.health import health_bp
-    
-    app.register_blueprint(health_bp, url_prefix='/api')
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(logs_bp, url_prefix='/api/logs')
-    app.register_blueprint(anomalies_bp, url_prefix='/api/anomalies')
-    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
-    app.register_blueprint(ai_bp, url_prefix='/api/ai')
+    Statements must be built the same way as in the views for the cache keys
+    to match; bound values (IDs, limits) don't affect the key.
+    """
+    from models import LogEntry, LogFile, User
+    from routes.anomalies import ANOMALY_LIST_COLUMNS
     
-    return app
+    probe_id = uuid.uuid4()
+    try:
+        db.session.query(User.jwt_version).filter(User.id == probe_id).scalar()
+        db.session.get(LogFile, probe_id)
+        # Same filter chain as a default /api/anomalies?log_file_id=... request
+        LogEntry.query.filter(LogEntry.is_anomalous == True).filter(
+            LogEntry.log_file_id == probe_id
+        ).filter(
+            LogEntry.anomaly_confidence >= 0.5
+        ).order_by(
+            LogEntry.timestamp.desc(), LogEntry.id.desc()
+        ).with_entities(*ANOMALY_LIST_COLUMNS).paginate(page=1, per_page=1, error_out=False)
+    except SQLAlchemyError as e:
+        app.logger.warning(f"Skipping statement cache warm-up: {str(e)}")
+    finally:
+        db.session.remove()
 
@@ -1,7 +1,11 @@
 """Flask extensions initialization."""
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
+from flask_caching import Cache
+from flask_compress import Compress
 
 db = SQLAlchemy()
 jwt = JWTManager()
+cache = Cache()
+compress = Compress()
 
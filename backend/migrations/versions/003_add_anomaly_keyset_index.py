@@ -0,0 +1,33 @@
+"""Add partial index backing keyset pagination of anomalies
+
+Revision ID: 003_anomaly_keyset_idx
+Revises: 002_add_index_ts
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_anomaly_keyset_idx'
+down_revision = '002_add_index_ts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Matches ORDER BY timestamp DESC, id DESC in list_anomalies so the
+    # keyset seek is served from the index without a sort. Partial on
+    # is_anomalous keeps it small since most rows are not anomalous.
+    op.create_index(
+        'ix_log_entries_anom_ts',
+        'log_entries',
+        ['log_file_id', sa.text('"timestamp" DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_anomalous = true'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_log_entries_anom_ts', table_name='log_entries')
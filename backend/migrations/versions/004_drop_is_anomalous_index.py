@@ -0,0 +1,25 @@
+"""Drop the full is_anomalous index
+
+Revision ID: 004_drop_anom_bool_idx
+Revises: 003_anomaly_keyset_idx
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004_drop_anom_bool_idx'
+down_revision = '003_anomaly_keyset_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The full boolean index is almost entirely false rows and is superseded
+    # by the partial index on anomalous rows in 003.
+    op.drop_index('ix_log_entries_is_anomalous', table_name='log_entries', if_exists=True)
+
+
+def downgrade():
+    op.create_index('ix_log_entries_is_anomalous', 'log_entries', ['is_anomalous'], unique=False)
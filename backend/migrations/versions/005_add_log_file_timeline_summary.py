@@ -0,0 +1,45 @@
+"""Add log_file_timeline_summary table
+
+Revision ID: 005_timeline_summary
+Revises: 004_drop_anom_bool_idx
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '005_timeline_summary'
+down_revision = '004_drop_anom_bool_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('log_file_timeline_summary',
+        sa.Column('log_file_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('bucket_ts', sa.DateTime(), nullable=False),
+        sa.Column('anomaly_type', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['log_file_id'], ['log_files.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('log_file_id', 'bucket_ts', 'anomaly_type')
+    )
+    # Backfill files that finished processing before this table existed.
+    # 5 minutes matches services.timeline_summary.SUMMARY_BUCKET_MINUTES.
+    op.execute("""
+        INSERT INTO log_file_timeline_summary (log_file_id, bucket_ts, anomaly_type, count)
+        SELECT e.log_file_id,
+               date_bin(INTERVAL '5 minutes', e."timestamp", TIMESTAMP '1970-01-01'),
+               COALESCE(e.anomaly_type, 'unknown'),
+               count(*)
+        FROM log_entries e
+        JOIN log_files f ON f.id = e.log_file_id
+        WHERE f.status = 'completed' AND e.is_anomalous = true
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade():
+    op.drop_table('log_file_timeline_summary')
@@ -0,0 +1,43 @@
+"""Add (log_file_id, column) composite indexes for dashboard aggregates
+
+Revision ID: 006_file_composite_idx
+Revises: 005_timeline_summary
+Create Date: 2026-10-15 13:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '006_file_composite_idx'
+down_revision = '005_timeline_summary'
+branch_labels = None
+depends_on = None
+
+# (log_file_id, timestamp) already exists as idx_log_entries_log_file_timestamp
+INDEXES = (
+    ('ix_log_entries_file_action', 'action'),
+    ('ix_log_entries_file_domain', 'domain'),
+    ('ix_log_entries_file_dept', 'department'),
+    ('ix_log_entries_file_cat', 'url_cat'),
+)
+
+
+def upgrade():
+    # CONCURRENTLY avoids locking log_entries against ingest writes, but
+    # cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.create_index(
+                name,
+                'log_entries',
+                ['log_file_id', column],
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name='log_entries', postgresql_concurrently=True)
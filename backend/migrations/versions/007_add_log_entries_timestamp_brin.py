@@ -0,0 +1,37 @@
+"""Add BRIN index on log_entries.timestamp for time-range scans
+
+Revision ID: 007_timestamp_brin
+Revises: 006_file_composite_idx
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '007_timestamp_brin'
+down_revision = '006_file_composite_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Entries are inserted roughly in timestamp order per upload, so a BRIN
+    # index lets time-ranged scans skip block ranges outside the window
+    # (similar to hypertable chunk exclusion) at a tiny fraction of the
+    # B-tree's size.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'brin_log_entries_timestamp',
+            'log_entries',
+            ['timestamp'],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('brin_log_entries_timestamp', table_name='log_entries', postgresql_concurrently=True)
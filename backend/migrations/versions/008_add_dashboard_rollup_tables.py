@@ -0,0 +1,68 @@
+"""Add log_entry_bucket_5m and log_entry_topn rollup tables
+
+Revision ID: 008_dashboard_rollups
+Revises: 007_timestamp_brin
+Create Date: 2026-10-15 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '008_dashboard_rollups'
+down_revision = '007_timestamp_brin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('log_entry_bucket_5m',
+        sa.Column('log_file_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('bucket_time', sa.DateTime(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('blocked', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['log_file_id'], ['log_files.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('log_file_id', 'bucket_time')
+    )
+    op.create_table('log_entry_topn',
+        sa.Column('log_file_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('dim', sa.String(length=20), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('blocked', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['log_file_id'], ['log_files.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('log_file_id', 'dim', 'key')
+    )
+    
+    # Backfill files that finished processing before these tables existed
+    op.execute("""
+        INSERT INTO log_entry_bucket_5m (log_file_id, bucket_time, total, blocked)
+        SELECT e.log_file_id,
+               date_bin(INTERVAL '5 minutes', e."timestamp", TIMESTAMP '1970-01-01'),
+               count(*),
+               count(*) FILTER (WHERE e.action = 'Blocked')
+        FROM log_entries e
+        JOIN log_files f ON f.id = e.log_file_id
+        WHERE f.status = 'completed'
+        GROUP BY 1, 2
+    """)
+    for dim in ('url_cat', 'domain', 'department'):
+        op.execute(f"""
+            INSERT INTO log_entry_topn (log_file_id, dim, key, count, blocked)
+            SELECT e.log_file_id,
+                   '{dim}',
+                   COALESCE(e.{dim}, ''),
+                   count(*),
+                   count(*) FILTER (WHERE e.action = 'Blocked')
+            FROM log_entries e
+            JOIN log_files f ON f.id = e.log_file_id
+            WHERE f.status = 'completed'
+            GROUP BY 1, 3
+        """)
+
+
+def downgrade():
+    op.drop_table('log_entry_topn')
+    op.drop_table('log_entry_bucket_5m')
@@ -0,0 +1,25 @@
+"""Add users.jwt_version for token revocation
+
+Revision ID: 009_user_jwt_version
+Revises: 008_dashboard_rollups
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_user_jwt_version'
+down_revision = '008_dashboard_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant default makes this a metadata-only change on PostgreSQL 11+
+    op.add_column('users', sa.Column('jwt_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('users', 'jwt_version')
@@ -1,14 +1,16 @@
 """Database models."""
 import uuid
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.dialects.postgresql import UUID, JSONB, INET, JSON
 from sqlalchemy import TypeDecorator, Text
-import json
+import orjson
+from operator import attrgetter
 from sqlalchemy import Column, String, Integer, Boolean, Float, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from extensions import db
+from utils.security import hash_password, verify_password
+from utils.json_provider import ORJSON_OPTIONS
 
 
 class JSONType(TypeDecorator):
@@ -25,12 +27,12 @@ class JSONType(TypeDecorator):
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        return json.dumps(value)
+        return orjson.dumps(value, option=ORJSON_OPTIONS).decode('utf-8')
     
     def process_result_value(self, value, dialect):
         if value is None:
             return value
-        return json.loads(value)
+        return orjson.loads(value)
 
 
 class UUIDType(TypeDecorator):
@@ -45,8 +47,8 @@ class UUIDType(TypeDecorator):
             return dialect.type_descriptor(String(36))
     
     def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
+        if value is None or dialect.name == 'postgresql':
+            return value  # Native UUID type binds uuid.UUID directly
         if isinstance(value, uuid.UUID):
             return str(value)
         return value
@@ -90,6 +92,7 @@ class User(db.Model):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
+    jwt_version = Column(Integer, default=0, server_default='0', nullable=False)  # Bumped on logout
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
@@ -98,11 +101,12 @@ class User(db.Model):
     
     def __init__(self, email, password):
         self.email = email
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
+        self.jwt_version = 0
     
     def check_password(self, password):
         """Check if provided password matches hash."""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
     
     def to_dict(self):
         """Convert user to dictionary."""
@@ -184,7 +188,7 @@ class LogEntry(db.Model):
     fw_rule = Column(String(100))
     policy_type = Column(String(100))
     reason = Column(String(255))
-    is_anomalous = Column(Boolean, default=False, index=True)
+    is_anomalous = Column(Boolean, default=False)  # Indexed by ix_log_entries_anom_ts (partial)
     anomaly_type = Column(String(50))  # burst_blocked, malicious_domain, risky_category, unusual_ua, large_download
     anomaly_reason = Column(Text)
     anomaly_confidence = Column(Float)
@@ -193,51 +197,96 @@ class LogEntry(db.Model):
     # Indexes
     __table_args__ = (
         Index('idx_log_entries_log_file_timestamp', 'log_file_id', 'timestamp'),
+        # Back the per-file dashboard aggregates (GROUP BY / FILTER on these columns)
+        Index('ix_log_entries_file_action', 'log_file_id', 'action'),
+        Index('ix_log_entries_file_domain', 'log_file_id', 'domain'),
+        Index('ix_log_entries_file_dept', 'log_file_id', 'department'),
+        Index('ix_log_entries_file_cat', 'log_file_id', 'url_cat'),
+        # Keyset pagination of anomalies (ORDER BY timestamp DESC, id DESC);
+        # partial, since most rows are not anomalous
+        Index(
+            'ix_log_entries_anom_ts', 'log_file_id', timestamp.desc(), id.desc(),
+            postgresql_where=is_anomalous == True
+        ),
+        # Block-range index for time-ranged scans of the whole table
+        Index(
+            'brin_log_entries_timestamp', 'timestamp',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
     )
     
     def to_dict(self):
         """Convert log entry to dictionary."""
-        return {
-            'id': str(self.id),
-            'log_file_id': str(self.log_file_id),
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
-            'location': self.location,
-            'protocol': self.protocol,
-            'url': self.url,
-            'domain': self.domain,
-            'action': self.action,
-            'app_name': self.app_name,
-            'app_class': self.app_class,
-            'throttle_req_size': self.throttle_req_size,
-            'throttle_resp_size': self.throttle_resp_size,
-            'req_size': self.req_size,
-            'resp_size': self.resp_size,
-            'url_class': self.url_class,
-            'url_supercat': self.url_supercat,
-            'url_cat': self.url_cat,
-            'dlp_dict': self.dlp_dict,
-            'dlp_eng': self.dlp_eng,
-            'dlp_hits': self.dlp_hits,
-            'file_class': self.file_class,
-            'file_type': self.file_type,
-            'location2': self.location2,
-            'department': self.department,
-            'client_ip': str(self.client_ip) if self.client_ip else None,
-            'server_ip': str(self.server_ip) if self.server_ip else None,
-            'http_method': self.http_method,
-            'http_status': self.http_status,
-            'user_agent': self.user_agent,
-            'threat_category': self.threat_category,
-            'fw_filter': self.fw_filter,
-            'fw_rule': self.fw_rule,
-            'policy_type': self.policy_type,
-            'reason': self.reason,
-            'is_anomalous': self.is_anomalous,
-            'anomaly_type': self.anomaly_type,
-            'anomaly_reason': self.anomaly_reason,
-            'anomaly_confidence': self.anomaly_confidence,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return LogEntry.row_to_dict(self)
+    
+    @classmethod
+    def dict_columns(cls):
+        """Columns to select() so result rows can be passed to row_to_dict."""
+        return tuple(getattr(cls, name) for name in _LOG_ENTRY_FIELDS)
+    
+    @staticmethod
+    def row_to_dict(row):
+        """Convert a LogEntry, or a row of dict_columns(), to the to_dict format."""
+        data = dict(zip(_LOG_ENTRY_FIELDS, _get_log_entry_fields(row)))
+        # Overwrite the few fields needing conversion; keys keep their position
+        data['id'] = str(row.id)
+        data['log_file_id'] = str(row.log_file_id)
+        data['timestamp'] = _isoformat(row.timestamp)
+        data['client_ip'] = str(row.client_ip) if row.client_ip else None
+        data['server_ip'] = str(row.server_ip) if row.server_ip else None
+        data['created_at'] = _isoformat(row.created_at)
+        return data
+
+
+def _isoformat(value):
+    """Format a datetime as ISO 8601, passing None through."""
+    return value.isoformat() if value else None
+
+
+# Field order of LogEntry.to_dict. Values are fetched with a single attrgetter
+# call instead of ~40 attribute lookups and conditionals per row.
+_LOG_ENTRY_FIELDS = (
+    'id', 'log_file_id', 'timestamp', 'location', 'protocol', 'url', 'domain',
+    'action', 'app_name', 'app_class', 'throttle_req_size', 'throttle_resp_size',
+    'req_size', 'resp_size', 'url_class', 'url_supercat', 'url_cat', 'dlp_dict',
+    'dlp_eng', 'dlp_hits', 'file_class', 'file_type', 'location2', 'department',
+    'client_ip', 'server_ip', 'http_method', 'http_status', 'user_agent',
+    'threat_category', 'fw_filter', 'fw_rule', 'policy_type', 'reason',
+    'is_anomalous', 'anomaly_type', 'anomaly_reason', 'anomaly_confidence',
+    'created_at'
+)
+_get_log_entry_fields = attrgetter(*_LOG_ENTRY_FIELDS)
+
+
+class LogFileTimelineSummary(db.Model):
+    """Per-bucket anomaly counts for a processed log file, written at ingest."""
+    __tablename__ = 'log_file_timeline_summary'
+    
+    log_file_id = Column(UUIDType(), ForeignKey('log_files.id', ondelete='CASCADE'), primary_key=True)
+    bucket_ts = Column(DateTime, primary_key=True)  # Bucket start (SUMMARY_BUCKET_MINUTES wide)
+    anomaly_type = Column(String(50), primary_key=True)  # 'unknown' when untyped
+    count = Column(Integer, nullable=False)
+
+
+class LogEntryBucket(db.Model):
+    """Five-minute request/blocked counts for a processed log file, written at ingest."""
+    __tablename__ = 'log_entry_bucket_5m'
+    
+    log_file_id = Column(UUIDType(), ForeignKey('log_files.id', ondelete='CASCADE'), primary_key=True)
+    bucket_time = Column(DateTime, primary_key=True)
+    total = Column(Integer, nullable=False)
+    blocked = Column(Integer, nullable=False)
+
+
+class LogEntryTopN(db.Model):
+    """Per-value request/blocked counts of a dashboard dimension, written at ingest."""
+    __tablename__ = 'log_entry_topn'
+    
+    log_file_id = Column(UUIDType(), ForeignKey('log_files.id', ondelete='CASCADE'), primary_key=True)
+    dim = Column(String(20), primary_key=True)  # url_cat, domain, department
+    key = Column(String(255), primary_key=True)  # '' when the column was NULL
+    count = Column(Integer, nullable=False)
+    blocked = Column(Integer, nullable=False)
 
 
 class UserRiskScore(db.Model):
@@ -1,57 +1,157 @@
 """AI routes."""
+import time
 import uuid
-from flask import Blueprint, request, jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, current_app
+from flask_caching.backends import NullCache, SimpleCache
+from sqlalchemy.orm import raiseload
 from models import LogEntry, LogFile
+from extensions import db, cache
 from services.ai_service import AIService
 from utils.kong_helpers import get_user_id_from_kong
+from utils.uuid_helpers import parse_uuid
+from utils.sql_helpers import no_autoflush
 
 ai_bp = Blueprint('ai', __name__)
-ai_service = AIService()
+_ai_service = None
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+# How long a summary for a file that is still processing is served without
+# triggering a background refresh, and how long stale copies are kept around
+SUMMARY_FRESH_SECONDS = 60
+SUMMARY_STALE_SECONDS = 600
+LOG_FILE_STATUS_TTL_SECONDS = 30
+# How long queued investigation results are kept for polling
+AI_JOB_TTL_SECONDS = 600
+
+
+def _get_ai_service():
+    """Return the shared AIService, constructing it on first use."""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
 
 
 @ai_bp.route('/log-summary/<log_file_id>', methods=['GET'])
+@no_autoflush
 def get_log_summary(log_file_id):
     """Get AI-generated log summary."""
     # Validate authentication
     get_user_id_from_kong()
-    try:
-        file_uuid = uuid.UUID(log_file_id)
-    except ValueError:
+    file_uuid = parse_uuid(log_file_id)
+    if file_uuid is None:
         return jsonify({'error': 'Invalid file ID'}), 400
     
-    log_file = LogFile.query.get(file_uuid)
-    if not log_file:
+    status = _get_log_file_status(file_uuid)
+    if status is None:
         return jsonify({'error': 'Log file not found'}), 404
     
-    summary = ai_service.generate_log_summary(log_file_id)
+    summary = _get_log_summary(file_uuid, status)
     
     return jsonify(summary), 200
 
 
+def _get_log_file_status(file_uuid):
+    """Return a log file's status, cached briefly, or None if it doesn't exist."""
+    key = f'ai:log_file_status:{file_uuid}'
+    status = cache.get(key)
+    if status is None:
+        log_file = db.session.get(LogFile, file_uuid)
+        if not log_file:
+            return None
+        status = log_file.status
+        cache.set(key, status, timeout=LOG_FILE_STATUS_TTL_SECONDS)
+    return status
+
+
+def _get_log_summary(file_uuid, status):
+    """
+    Return the AI summary for a log file, using the cache where possible.
+    
+    Summaries of completed files never change, so they are cached without
+    expiry. Summaries of files still being processed are served
+    stale-while-revalidate: a cached copy is returned immediately and, once
+    older than SUMMARY_FRESH_SECONDS, refreshed in a background thread.
+    """
+    if status == 'completed':
+        key = f'ai:log_summary:{file_uuid}'
+        summary = cache.get(key)
+        if summary is None:
+            summary = _get_ai_service().generate_log_summary(file_uuid)
+            cache.set(key, summary, timeout=0)
+        return summary
+    
+    key = f'ai:log_summary_live:{file_uuid}'
+    cached = cache.get(key)
+    if cached is None:
+        return _store_live_summary(key, file_uuid)
+    
+    if time.time() - cached['cached_at'] > SUMMARY_FRESH_SECONDS:
+        _schedule_summary_refresh(key, file_uuid)
+    return cached['summary']
+
+
+def _store_live_summary(key, file_uuid):
+    """Generate a summary and cache it with its generation time."""
+    summary = _get_ai_service().generate_log_summary(file_uuid)
+    cache.set(key, {'summary': summary, 'cached_at': time.time()}, timeout=SUMMARY_STALE_SECONDS)
+    return summary
+
+
+def _schedule_summary_refresh(key, file_uuid):
+    """Refresh a live summary in the background, at most one refresh at a time."""
+    # cache.add only succeeds if the key is absent, so it doubles as a lock
+    if not cache.add(f'{key}:refreshing', True, timeout=SUMMARY_FRESH_SECONDS):
+        return
+    
+    app = current_app._get_current_object()
+    thread = threading.Thread(
+        target=_refresh_summary_async,
+        args=(app, key, file_uuid),
+        daemon=True
+    )
+    thread.start()
+
+
+def _refresh_summary_async(app, key, file_uuid):
+    """Regenerate a cached live summary in a background thread."""
+    with app.app_context():
+        try:
+            _store_live_summary(key, file_uuid)
+        except Exception as e:
+            app.logger.error(f"Error refreshing summary for {file_uuid}: {str(e)}", exc_info=True)
+        finally:
+            cache.delete(f'{key}:refreshing')
+
+
 @ai_bp.route('/explain-log-entry/<entry_id>', methods=['GET'])
+@no_autoflush
 def explain_log_entry(entry_id):
     """Get AI explanation for log entry."""
     # Validate authentication
     get_user_id_from_kong()
-    try:
-        entry_uuid = uuid.UUID(entry_id)
-    except ValueError:
+    entry_uuid = parse_uuid(entry_id)
+    if entry_uuid is None:
         return jsonify({'error': 'Invalid entry ID'}), 400
     
-    entry = LogEntry.query.get(entry_uuid)
+    entry = db.session.get(LogEntry, entry_uuid, options=[raiseload('*')])
     if not entry:
         return jsonify({'error': 'Log entry not found'}), 404
     
-    explanation = ai_service.explain_log_entry(entry)
+    explanation = _get_ai_service().explain_log_entry(entry)
     
     return jsonify(explanation), 200
 
 
 @ai_bp.route('/investigate', methods=['POST'])
+@no_autoflush
 def investigate():
     """AI investigation copilot."""
     # Validate authentication
-    get_user_id_from_kong()
+    user_id = get_user_id_from_kong()
     data = request.get_json()
     
     if not data or not data.get('log_file_id') or not data.get('question'):
@@ -60,11 +160,89 @@ def investigate():
     log_file_id = data['log_file_id']
     question = data['question']
     
-    try:
-        file_uuid = uuid.UUID(log_file_id)
-    except ValueError:
+    file_uuid = parse_uuid(log_file_id)
+    if file_uuid is None:
         return jsonify({'error': 'Invalid file ID'}), 400
     
-    result = ai_service.investigate(file_uuid, question)
+    # Opt-in deferred mode: queue the question and let the client poll, so
+    # a slow model call doesn't hold the request worker
+    if data.get('async'):
+        # Job state lives in the cache; with a per-process backend, polls
+        # handled by another worker would never find the job
+        if not _job_state_is_shared():
+            return jsonify({
+                'error': 'Async investigations require a shared cache (CACHE_TYPE=RedisCache)'
+            }), 501
+        job_id = _submit_investigation(user_id, file_uuid, question)
+        return jsonify({
+            'job_id': job_id,
+            'status': 'pending',
+            'status_url': f'/api/ai/investigate/{job_id}'
+        }), 202
+    
+    result = _get_ai_service().investigate(file_uuid, question)
     
     return jsonify(result), 200
+
+
+@ai_bp.route('/investigate/<job_id>', methods=['GET'])
+def get_investigation(job_id):
+    """Get the status, and result once done, of a queued investigation."""
+    # Validate authentication
+    user_id = get_user_id_from_kong()
+    job = cache.get(f'ai:investigation:{job_id}')
+    # Another user's job is reported as missing rather than forbidden
+    if job is None or job['user_id'] != str(user_id):
+        return jsonify({'error': 'Investigation not found'}), 404
+    
+    return jsonify({key: value for key, value in job.items() if key != 'user_id'}), 200
+
+
+def _job_state_is_shared():
+    """Whether every worker process sees the same cache, and so the same jobs."""
+    return not isinstance(cache.cache, (SimpleCache, NullCache))
+
+
+def _get_job_executor():
+    """Return the shared executor for queued AI jobs, creating it on first use."""
+    global _job_executor
+    if _job_executor is None:
+        with _job_executor_lock:
+            if _job_executor is None:
+                _job_executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('AI_JOB_WORKERS', 4),
+                    thread_name_prefix='ai-job'
+                )
+    return _job_executor
+
+
+def _submit_investigation(user_id, file_uuid, question):
+    """
+    Queue an investigation for a user and return its job ID.
+    
+    Job state lives in the cache, which must be shared between workers
+    (see _job_state_is_shared); only the submitting user can read it.
+    """
+    job_id = str(uuid.uuid4())
+    key = f'ai:investigation:{job_id}'
+    owner = str(user_id)
+    cache.set(key, {'job_id': job_id, 'user_id': owner, 'status': 'pending'}, timeout=AI_JOB_TTL_SECONDS)
+    
+    app = current_app._get_current_object()
+    _get_job_executor().submit(_run_investigation, app, key, job_id, owner, file_uuid, question)
+    return job_id
+
+
+def _run_investigation(app, key, job_id, owner, file_uuid, question):
+    """Run a queued investigation and store its outcome in the cache."""
+    job = {'job_id': job_id, 'user_id': owner}
+    with app.app_context():
+        try:
+            result = _get_ai_service().investigate(file_uuid, question)
+            job.update(status='completed', result=result)
+        except Exception as e:
+            app.logger.error(f"Error running investigation {job_id}: {str(e)}", exc_info=True)
+            job.update(status='failed', error='Investigation failed')
+        finally:
+            db.session.remove()
+        cache.set(key, job, timeout=AI_JOB_TTL_SECONDS)
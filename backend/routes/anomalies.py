@@ -1,34 +1,53 @@
 """Anomalies routes."""
-import uuid
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
-from sqlalchemy import and_
-from models import LogEntry
+from sqlalchemy import and_, func, literal, tuple_
+from sqlalchemy.orm import raiseload
+from models import LogEntry, LogFile
 from extensions import db
+from services.timeline_summary import can_use_timeline_summary, load_timeline_summary
 from utils.kong_helpers import get_user_id_from_kong
+from utils.pagination import decode_cursor, fetch_keyset_page, page_limit
+from utils.sql_helpers import bucket_timestamp, bucket_to_datetime, no_autoflush
+from utils.uuid_helpers import parse_log_file_id
 
 anomalies_bp = Blueprint('anomalies', __name__)
 
+# Columns loaded for the anomaly list. The large url/user_agent TEXT columns
+# are skipped unless full entries are requested with ?full=1.
+ANOMALY_LIST_COLUMNS = (
+    LogEntry.id,
+    LogEntry.log_file_id,
+    LogEntry.timestamp,
+    LogEntry.domain,
+    LogEntry.action,
+    LogEntry.url_cat,
+    LogEntry.threat_category,
+    LogEntry.department,
+    LogEntry.client_ip,
+    LogEntry.anomaly_type,
+    LogEntry.anomaly_reason,
+    LogEntry.anomaly_confidence,
+)
+
 
 @anomalies_bp.route('', methods=['GET'])
+@no_autoflush
 def list_anomalies():
     """List anomalies."""
     # Validate authentication
     get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     anomaly_type = request.args.get('anomaly_type')
     min_confidence = request.args.get('min_confidence', 0.5, type=float)
     page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 50, type=int)
+    limit = page_limit(50)
+    full = request.args.get('full', 'false').lower() in ('1', 'true')
     
     query = LogEntry.query.filter(LogEntry.is_anomalous == True)
     
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
+    if file_uuid:
+        query = query.filter(LogEntry.log_file_id == file_uuid)
     
     if anomaly_type:
         query = query.filter(LogEntry.anomaly_type == anomaly_type)
@@ -36,53 +55,121 @@ def list_anomalies():
     if min_confidence:
         query = query.filter(LogEntry.anomaly_confidence >= min_confidence)
     
-    entries = query.order_by(LogEntry.timestamp.desc()).paginate(
-        page=page, per_page=limit, error_out=False
-    )
+    query = query.order_by(LogEntry.timestamp.desc(), LogEntry.id.desc())
+    
+    # Select plain rows rather than hydrating full ORM objects unless requested
+    if full:
+        # to_dict never touches relationships; fail loudly if that changes
+        query = query.options(raiseload('*'))
+        serialize = _serialize_anomaly
+    else:
+        query = query.with_entities(*ANOMALY_LIST_COLUMNS)
+        serialize = _serialize_anomaly_row
+    
+    # Keyset pagination when a cursor is supplied (empty cursor = first page).
+    # Seeks past the last (timestamp, id) seen instead of scanning OFFSET rows,
+    # and skips the COUNT(*) that paginate() issues.
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        if cursor:
+            try:
+                last_timestamp, last_id = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(
+                tuple_(LogEntry.timestamp, LogEntry.id) < tuple_(
+                    literal(last_timestamp, LogEntry.timestamp.type),
+                    literal(last_id, LogEntry.id.type)
+                )
+            )
+        
+        items, next_cursor, has_more = fetch_keyset_page(query, limit)
+        
+        return jsonify({
+            'anomalies': [serialize(entry) for entry in items],
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }), 200
     
-    anomalies = []
-    for entry in entries.items:
-        anomalies.append({
-            'entry_id': str(entry.id),
-            'log_entry': entry.to_dict(),
-            'anomaly_type': entry.anomaly_type,
-            'reason': entry.anomaly_reason,
-            'confidence': entry.anomaly_confidence
-        })
+    entries = query.paginate(page=page, per_page=limit, error_out=False)
     
     return jsonify({
-        'anomalies': anomalies,
+        'anomalies': [serialize(entry) for entry in entries.items],
         'total': entries.total
     }), 200
 
 
+def _serialize_anomaly(entry):
+    """Convert an anomalous log entry to the anomaly list response format."""
+    return {
+        'entry_id': str(entry.id),
+        'log_entry': entry.to_dict(),
+        'anomaly_type': entry.anomaly_type,
+        'reason': entry.anomaly_reason,
+        'confidence': entry.anomaly_confidence
+    }
+
+
+def _serialize_anomaly_row(row):
+    """Convert a row of ANOMALY_LIST_COLUMNS to the anomaly list response format."""
+    return {
+        'entry_id': row.id,
+        'log_entry': {
+            'id': row.id,
+            'log_file_id': row.log_file_id,
+            'timestamp': row.timestamp,
+            'domain': row.domain,
+            'action': row.action,
+            'url_cat': row.url_cat,
+            'threat_category': row.threat_category,
+            'department': row.department,
+            'client_ip': str(row.client_ip) if row.client_ip else None,
+            'is_anomalous': True,
+            'anomaly_type': row.anomaly_type,
+            'anomaly_reason': row.anomaly_reason,
+            'anomaly_confidence': row.anomaly_confidence
+        },
+        'anomaly_type': row.anomaly_type,
+        'reason': row.anomaly_reason,
+        'confidence': row.anomaly_confidence
+    }
+
+
 @anomalies_bp.route('/timeline', methods=['GET'])
+@no_autoflush
 def get_anomaly_timeline():
     """Get anomaly timeline."""
     # Validate authentication
     get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     bucket_minutes = request.args.get('bucket_minutes', 15, type=int)
     
-    query = LogEntry.query.filter(LogEntry.is_anomalous == True)
+    if bucket_minutes <= 0:
+        return jsonify({'error': 'bucket_minutes must be greater than 0'}), 400
+    
+    # Completed files have a precomputed summary; roll it up instead of
+    # aggregating raw entries
+    if file_uuid and can_use_timeline_summary(bucket_minutes):
+        log_file = db.session.get(LogFile, file_uuid)
+        if log_file and log_file.status == 'completed':
+            return jsonify({'buckets': load_timeline_summary(file_uuid, bucket_minutes)}), 200
+    
+    # Aggregate in the database so only one row per (bucket, type) is returned
+    bucket = bucket_timestamp(LogEntry.timestamp, bucket_minutes).label('bucket')
+    query = db.session.query(
+        bucket,
+        LogEntry.anomaly_type,
+        func.count().label('count')
+    ).filter(LogEntry.is_anomalous == True)
     
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
+    if file_uuid:
+        query = query.filter(LogEntry.log_file_id == file_uuid)
     
-    entries = query.all()
+    rows = query.group_by(bucket, LogEntry.anomaly_type).order_by(bucket).all()
     
     buckets = {}
-    for entry in entries:
-        bucket_time = entry.timestamp.replace(
-            minute=(entry.timestamp.minute // bucket_minutes) * bucket_minutes,
-            second=0,
-            microsecond=0
-        )
-        key = bucket_time.isoformat()
+    for bucket_value, anomaly_type, count in rows:
+        key = bucket_to_datetime(bucket_value).isoformat()
         
         if key not in buckets:
             buckets[key] = {
@@ -91,8 +178,8 @@ def get_anomaly_timeline():
                 'by_type': {}
             }
         
-        buckets[key]['count'] += 1
-        anomaly_type = entry.anomaly_type or 'unknown'
-        buckets[key]['by_type'][anomaly_type] = buckets[key]['by_type'].get(anomaly_type, 0) + 1
+        buckets[key]['count'] += count
+        anomaly_type = anomaly_type or 'unknown'
+        buckets[key]['by_type'][anomaly_type] = buckets[key]['by_type'].get(anomaly_type, 0) + count
     
     return jsonify({'buckets': list(buckets.values())}), 200
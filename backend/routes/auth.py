@@ -1,11 +1,12 @@
 """Authentication routes."""
 import uuid
-from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, get_jwt
-from models import User, TokenBlacklist
+from models import User
 from extensions import db
 from utils.kong_helpers import get_user_id_from_kong
+from utils.security import hash_password, password_needs_rehash
+from utils.revocation_cache import set_jwt_version
 from config import Config
 
 auth_bp = Blueprint('auth', __name__)
@@ -28,11 +29,17 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid credentials'}), 401
     
+    # Upgrade legacy Werkzeug hashes (or outdated Argon2 parameters) in place
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+        db.session.commit()
+    
     # Create access token with additional claims for Kong
-    jti = str(uuid.uuid4())  # Unique token ID for blacklist tracking
+    jti = str(uuid.uuid4())  # Unique token ID
     additional_claims = {
         "iss": "flask-jwt",  # Issuer claim for Kong JWT plugin
-        "jti": jti  # JWT ID for token revocation
+        "jti": jti,
+        "ver": user.jwt_version  # Invalidated when logout bumps the user's version
     }
     access_token = create_access_token(
         identity=str(user.id),
@@ -47,37 +54,14 @@ def login():
 
 @auth_bp.route('/logout', methods=['POST'])
 def logout():
-    """Logout endpoint - adds token to blacklist."""
-    # Get user ID and JWT claims
+    """Logout endpoint - revokes all of the user's outstanding tokens."""
     user_id = get_user_id_from_kong()
     
-    # Get JWT claims from the decoded token
-    from flask import request as flask_request
-    from flask_jwt_extended import decode_token
-    
-    auth_header = flask_request.headers.get('Authorization', '')
-    token = auth_header.split(' ', 1)[1] if len(auth_header.split(' ')) > 1 else None
-    
-    if token:
-        try:
-            decoded = decode_token(token)
-            jti = decoded.get('jti')
-            exp_timestamp = decoded.get('exp')
-            
-            if jti and exp_timestamp:
-                # Add token to blacklist
-                expires_at = datetime.fromtimestamp(exp_timestamp)
-                blacklisted_token = TokenBlacklist(
-                    jti=jti,
-                    token_type='access',
-                    user_id=user_id,
-                    expires_at=expires_at
-                )
-                db.session.add(blacklisted_token)
-                db.session.commit()
-        except Exception as e:
-            # If we can't blacklist, still return success (client-side logout)
-            pass
+    user = db.session.get(User, user_id)
+    if user:
+        user.jwt_version += 1
+        db.session.commit()
+        set_jwt_version(user_id, user.jwt_version)
     
     return jsonify({'message': 'Logged out successfully'}), 200
 
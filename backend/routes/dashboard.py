@@ -1,52 +1,68 @@
 """Dashboard routes."""
-import uuid
 import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import Blueprint, request, jsonify
-from sqlalchemy import func, and_, text
+from flask import Blueprint, current_app, g, request, jsonify
+from sqlalchemy import func, and_, literal, select, text, tuple_
 from models import LogEntry, LogFile, UserRiskScore
 from extensions import db
 from utils.kong_helpers import get_user_id_from_kong
+from utils.pagination import decode_cursor, fetch_keyset_page, page_limit
+from utils.response_cache import cached_response
+from utils.time_helpers import parse_iso_datetime
+from utils.sql_helpers import bucket_timestamp, bucket_to_datetime, percent_of_total
+from utils.uuid_helpers import parse_log_file_id
+from services.dashboard_rollups import (
+    can_roll_up_timeline, has_rollups, load_timeline, load_top_n
+)
 
 logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__)
+_summary_executor = None
+_summary_executor_lock = threading.Lock()
+
+
+@dashboard_bp.before_request
+def _authenticate():
+    """Validate the caller once per request; views read the ID from g.user_id."""
+    g.user_id = get_user_id_from_kong()
 
 
 @dashboard_bp.route('/stats', methods=['GET'])
+@cached_response
 def get_stats():
     """Get dashboard statistics."""
-    # Validate authentication
-    get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
-    
-    query = LogEntry.query
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
-    
-    total_requests = query.count()
-    blocked_events = query.filter(LogEntry.action == 'Blocked').count()
-    malicious_urls = query.filter(LogEntry.is_anomalous == True).count()
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
+    return jsonify(_stats(file_uuid)), 200
+
+
+def _stats(file_uuid):
+    """Build the /stats payload, optionally for one log file."""
+    # Core selects: no ORM Query or entity machinery on this hot path
+    entry_conds = [LogEntry.log_file_id == file_uuid] if file_uuid else []
+    risk_conds = [UserRiskScore.log_file_id == file_uuid] if file_uuid else []
+    
+    # One scan of log_entries for all entry-level figures
+    total_requests, blocked_events, malicious_urls, data_transfer_bytes = db.session.execute(
+        select(
+            func.count(),
+            func.count().filter(LogEntry.action == 'Blocked'),
+            func.count().filter(LogEntry.is_anomalous == True),
+            func.coalesce(func.sum(LogEntry.resp_size), 0)
+        ).select_from(LogEntry).where(*entry_conds)
+    ).one()
     
     # High-risk users (risk_score > 70)
-    risk_query = UserRiskScore.query
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            risk_query = risk_query.filter(UserRiskScore.log_file_id == file_uuid)
-        except ValueError:
-            pass
-    high_risk_users = risk_query.filter(UserRiskScore.risk_score > 70).count()
-    
-    # Data transfer
-    result = query.with_entities(func.sum(LogEntry.resp_size)).scalar()
-    data_transfer_bytes = result or 0
+    high_risk_users = db.session.execute(
+        select(func.count()).select_from(UserRiskScore).where(
+            UserRiskScore.risk_score > 70, *risk_conds
+        )
+    ).scalar()
     
-    return jsonify({
+    return {
         'total_requests': total_requests,
         'blocked_events': blocked_events,
         'malicious_urls': malicious_urls,
@@ -56,82 +72,128 @@ def get_stats():
             'total_requests_pct': 0.0,  # Would calculate from previous period
             'blocked_events_pct': 0.0
         }
-    }), 200
+    }
 
 
 @dashboard_bp.route('/timeline', methods=['GET'])
+@cached_response
 def get_timeline():
     """Get timeline data for charts."""
-    # Validate authentication
-    get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     bucket_minutes = request.args.get('bucket_minutes', 15, type=int)
     hours = request.args.get('hours', 24, type=int)
     
+    if bucket_minutes <= 0:
+        return jsonify({'error': 'bucket_minutes must be greater than 0'}), 400
+    
+    return jsonify(_timeline(file_uuid, bucket_minutes, hours)), 200
+
+
+def _timeline(file_uuid, bucket_minutes, hours):
+    """Build the /timeline payload, optionally for one log file."""
     query = LogEntry.query
     
     # Determine time range based on whether log_file_id is provided
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            # Filter by log file
-            query = query.filter(LogEntry.log_file_id == file_uuid)
+    if file_uuid:
+        # Filter by log file
+        query = query.filter(LogEntry.log_file_id == file_uuid)
+        
+        # Get the log file to use its date range
+        log_file = db.session.get(LogFile, file_uuid)
+        if log_file and log_file.date_range_start and log_file.date_range_end:
+            # Use the file's date range, but apply hours parameter relative to end date
+            end_time = log_file.date_range_end
+            start_time = end_time - timedelta(hours=hours)
+            # Don't go before the file's start date
+            if start_time < log_file.date_range_start:
+                start_time = log_file.date_range_start
             
-            # Get the log file to use its date range
-            log_file = LogFile.query.filter_by(id=file_uuid).first()
-            if log_file and log_file.date_range_start and log_file.date_range_end:
-                # Use the file's date range, but apply hours parameter relative to end date
-                end_time = log_file.date_range_end
-                start_time = end_time - timedelta(hours=hours)
-                # Don't go before the file's start date
-                if start_time < log_file.date_range_start:
-                    start_time = log_file.date_range_start
-                
-                query = query.filter(
-                    and_(
-                        LogEntry.timestamp >= start_time,
-                        LogEntry.timestamp <= end_time
-                    )
+            query = query.filter(
+                and_(
+                    LogEntry.timestamp >= start_time,
+                    LogEntry.timestamp <= end_time
                 )
-            # If file has no date range, don't filter by time (show all entries for this file)
-        except ValueError:
-            pass
+            )
+        # If file has no date range, don't filter by time (show all entries for this file)
     else:
         # No log_file_id: show all available data (no time filter)
         # This allows viewing historical data regardless of when it was logged
         pass
     
-    # Group by time buckets (simplified - would use proper time bucketing in production)
-    entries = query.all()
+    # Aggregate in the database so only one row per bucket crosses the wire
+    bucket = bucket_timestamp(LogEntry.timestamp, bucket_minutes).label('bucket')
+    rows = query.with_entities(
+        bucket,
+        func.count().label('total'),
+        func.count().filter(LogEntry.action == 'Blocked').label('blocked')
+    ).group_by(bucket).order_by(bucket).all()
+    
+    buckets = [
+        {
+            'time': bucket_to_datetime(bucket_value),
+            'total': total,
+            'blocked': blocked
+        }
+        for bucket_value, total, blocked in rows
+    ]
     
-    buckets = {}
-    for entry in entries:
-        # Round to nearest bucket
-        bucket_time = entry.timestamp.replace(
-            minute=(entry.timestamp.minute // bucket_minutes) * bucket_minutes,
-            second=0,
-            microsecond=0
+    return {'buckets': buckets}
+
+
+def _timeline_v2_sql(where_clause):
+    """
+    Build the /timeline/v2 statement for a WHERE clause.
+    
+    Buckets come from generate_series and entries are floored within the
+    hour with date_trunc; the bucket width is a bound parameter so the
+    statement text, and SQLAlchemy's compiled form of it, never change.
+    """
+    return text(f"""
+        WITH buckets AS (
+            SELECT generate_series(
+                date_trunc('minute', CAST(:start_time AS timestamp)),
+                date_trunc('minute', CAST(:end_time AS timestamp)),
+                make_interval(mins => :bucket_minutes)
+            ) AS bucket_time
+        ),
+        counts AS (
+            SELECT
+                date_trunc('hour', "timestamp")
+                    + floor(extract(minute FROM "timestamp") / :bucket_minutes)
+                    * make_interval(mins => :bucket_minutes) AS bucket_time,
+                count(*) AS log_count,
+                count(*) FILTER (WHERE action = 'Blocked') AS blocked_count
+            FROM log_entries
+            WHERE {where_clause}
+            GROUP BY bucket_time
         )
-        key = bucket_time.isoformat()
-        
-        if key not in buckets:
-            buckets[key] = {'time': key, 'total': 0, 'blocked': 0}
-        
-        buckets[key]['total'] += 1
-        if entry.action == 'Blocked':
-            buckets[key]['blocked'] += 1
-    
-    return jsonify({'buckets': list(buckets.values())}), 200
+        SELECT
+            b.bucket_time,
+            COALESCE(c.log_count, 0) AS log_count,
+            COALESCE(c.blocked_count, 0) AS blocked_count
+        FROM buckets b
+        LEFT JOIN counts c ON b.bucket_time = c.bucket_time
+        ORDER BY b.bucket_time
+    """)
+
+
+# "timestamp" is quoted as a PostgreSQL reserved word; CAST is used instead
+# of :: so SQLAlchemy's parameter parsing isn't confused. The upper bound
+# covers the whole last bucket.
+_TIMELINE_V2_WHERE = (
+    '"timestamp" >= CAST(:start_time AS timestamp) '
+    'AND "timestamp" < CAST(:end_time AS timestamp) + make_interval(mins => :bucket_minutes)'
+)
+TIMELINE_V2_SQL = _timeline_v2_sql(_TIMELINE_V2_WHERE)
+TIMELINE_V2_FILE_SQL = _timeline_v2_sql(_TIMELINE_V2_WHERE + ' AND log_file_id = :log_file_id')
 
 
 @dashboard_bp.route('/timeline/v2', methods=['GET'])
+@cached_response
 def get_timeline_v2():
     """Get timeline data using PostgreSQL bucketing for better performance."""
-    # Validate authentication
-    get_user_id_from_kong()
-    
     # Parse parameters
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     bucket_minutes = request.args.get('bucket_minutes', 15, type=int)
     start_time_str = request.args.get('start_time')
     end_time_str = request.args.get('end_time')
@@ -145,28 +207,23 @@ def get_timeline_v2():
     
     # Determine time range
     if start_time_str and end_time_str:
-        try:
-            start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-        except ValueError:
+        start_time = parse_iso_datetime(start_time_str)
+        end_time = parse_iso_datetime(end_time_str)
+        if start_time is None or end_time is None:
             return jsonify({'error': 'Invalid date format. Use ISO 8601 format.'}), 400
         
         if start_time >= end_time:
             return jsonify({'error': 'start_time must be before end_time'}), 400
-    elif log_file_id:
+    elif file_uuid:
         # Use log file date range if available
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            log_file = LogFile.query.filter_by(id=file_uuid).first()
-            if log_file and log_file.date_range_start and log_file.date_range_end:
-                start_time = log_file.date_range_start
-                end_time = log_file.date_range_end
-            else:
-                # Fallback to last 24 hours
-                end_time = datetime.utcnow()
-                start_time = end_time - timedelta(hours=24)
-        except ValueError:
-            return jsonify({'error': 'Invalid log_file_id format'}), 400
+        log_file = db.session.get(LogFile, file_uuid)
+        if log_file and log_file.date_range_start and log_file.date_range_end:
+            start_time = log_file.date_range_start
+            end_time = log_file.date_range_end
+        else:
+            # Fallback to last 24 hours
+            end_time = datetime.utcnow()
+            start_time = end_time - timedelta(hours=24)
     else:
         # Default to last 24 hours
         end_time = datetime.utcnow()
@@ -185,176 +242,146 @@ def get_timeline_v2():
         microsecond=0
     )
     
-    # Build WHERE clause conditions (using quoted column name for PostgreSQL reserved word)
-    # Use CAST instead of :: syntax to work with SQLAlchemy parameter binding
-    where_conditions = ['"timestamp" >= CAST(:start_time AS timestamp)', '"timestamp" <= CAST(:end_time AS timestamp)']
+    # Completed files have pre-rolled 5-minute buckets; serve from those
+    if file_uuid and can_roll_up_timeline(bucket_minutes) and has_rollups(file_uuid):
+        rows = load_timeline(file_uuid, bucket_minutes, start_time_truncated, end_time_truncated)
+        response_data = {'buckets': [
+            _timeline_v2_bucket(bucket_time, log_count, blocked_count)
+            for bucket_time, log_count, blocked_count in rows
+        ]}
+        if debug_query:
+            response_data['debug'] = {'source': 'log_entry_bucket_5m'}
+        return jsonify(response_data), 200
+    
     query_params = {
         'start_time': start_time_truncated.isoformat(),
         'end_time': end_time_truncated.isoformat(),
         'bucket_minutes': bucket_minutes
     }
+    sql_query = TIMELINE_V2_SQL
+    if file_uuid:
+        query_params['log_file_id'] = str(file_uuid)
+        sql_query = TIMELINE_V2_FILE_SQL
     
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            where_conditions.append('log_file_id = :log_file_id')
-            query_params['log_file_id'] = str(file_uuid)
-        except ValueError:
-            return jsonify({'error': 'Invalid log_file_id format'}), 400
-    
-    where_clause = ' AND '.join(where_conditions)
-    
-    # PostgreSQL query using generate_series for buckets and date_trunc for bucketing
-    # Build interval string directly since bucket_minutes is validated as integer
-    interval_str = f"{bucket_minutes} minutes"
-    
-    sql_query = text(f"""
-        WITH buckets AS (
-            SELECT generate_series(
-                date_trunc('minute', CAST(:start_time AS timestamp)),
-                date_trunc('minute', CAST(:end_time AS timestamp)),
-                interval '{interval_str}'
-            ) AS bucket_time
-        ),
-        counts AS (
-            SELECT
-                date_trunc('hour', "timestamp")
-                    + floor(extract(minute FROM "timestamp") / :bucket_minutes) * interval '{interval_str}' AS bucket_time,
-                count(*) AS log_count,
-                count(*) FILTER (WHERE action = 'Blocked') AS blocked_count
-            FROM log_entries
-            WHERE {where_clause}
-            GROUP BY bucket_time
-        )
-        SELECT
-            b.bucket_time,
-            COALESCE(c.log_count, 0) AS log_count,
-            COALESCE(c.blocked_count, 0) AS blocked_count
-        FROM buckets b
-        LEFT JOIN counts c ON b.bucket_time = c.bucket_time
-        ORDER BY b.bucket_time
-    """)
-    
-    # Build a readable version of the query with parameters substituted for debugging
-    final_query_readable = sql_query.text
-    for param_name, param_value in query_params.items():
-        # Replace parameter placeholders with actual values for logging
-        if isinstance(param_value, str):
-            # Quote strings properly for SQL
-            final_query_readable = final_query_readable.replace(
-                f':{param_name}', 
-                f"'{param_value}'"
-            )
-        else:
-            final_query_readable = final_query_readable.replace(
-                f':{param_name}', 
-                str(param_value)
-            )
-    
-    logger.info(f"Timeline V2 Query:\n{final_query_readable}")
-    logger.info(f"Query Parameters: {query_params}")
-    
-    # Also print to console for immediate visibility
-    print("\n" + "="*80)
-    print("TIMELINE V2 SQL QUERY:")
-    print("="*80)
-    print(final_query_readable)
-    print("\nPARAMETERS:")
-    for key, value in query_params.items():
-        print(f"  {key}: {value} ({type(value).__name__})")
-    print("="*80 + "\n")
+    logger.debug("Timeline V2 query", extra={'params': query_params})
     
     try:
         result = db.session.execute(sql_query, query_params)
-        buckets = []
-        for row in result:
-            buckets.append({
-                'time': row.bucket_time.isoformat() if row.bucket_time else None,
-                'bucket_time': row.bucket_time.isoformat() if row.bucket_time else None,
-                'log_count': int(row.log_count) if row.log_count else 0,
-                'total': int(row.log_count) if row.log_count else 0,  # Alias for backward compatibility
-                'blocked_count': int(row.blocked_count) if row.blocked_count else 0,
-                'blocked': int(row.blocked_count) if row.blocked_count else 0  # Alias for backward compatibility
-            })
+        buckets = [
+            _timeline_v2_bucket(row.bucket_time, row.log_count, row.blocked_count)
+            for row in result
+        ]
         
         response_data = {'buckets': buckets}
         
         # Include query in response if debug_query=true
         if debug_query:
             response_data['debug'] = {
-                'query': final_query_readable,
+                'query': _render_timeline_v2_sql(sql_query, query_params),
                 'query_template': sql_query.text,
-                'parameters': query_params,
-                'where_clause': where_clause,
-                'interval_str': interval_str
+                'parameters': query_params
             }
         
         return jsonify(response_data), 200
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        return jsonify({
-            'error': f'Database query failed: {str(e)}',
-            'details': error_details
-        }), 500
+        logger.exception("Timeline V2 query failed")
+        response_data = {'error': f'Database query failed: {str(e)}'}
+        if debug_query:
+            response_data['details'] = traceback.format_exc()
+        return jsonify(response_data), 500
+
+
+def _render_timeline_v2_sql(sql_query, query_params):
+    """Substitute parameters into a /timeline/v2 statement for debug output."""
+    rendered = sql_query.text
+    for param_name, param_value in query_params.items():
+        if isinstance(param_value, str):
+            param_value = f"'{param_value}'"
+        rendered = rendered.replace(f':{param_name}', str(param_value))
+    return rendered
+
+
+def _timeline_v2_bucket(bucket_time, log_count, blocked_count):
+    """Format a /timeline/v2 bucket, including the legacy field aliases."""
+    log_count = int(log_count) if log_count else 0
+    blocked_count = int(blocked_count) if blocked_count else 0
+    return {
+        'time': bucket_time,
+        'bucket_time': bucket_time,
+        'log_count': log_count,
+        'total': log_count,  # Alias for backward compatibility
+        'blocked_count': blocked_count,
+        'blocked': blocked_count  # Alias for backward compatibility
+    }
 
 
 @dashboard_bp.route('/top-categories', methods=['GET'])
+@cached_response
 def get_top_categories():
     """Get top URL categories."""
-    # Validate authentication
-    get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     limit = request.args.get('limit', 10, type=int)
-    
-    query = LogEntry.query.with_entities(
-        LogEntry.url_cat,
-        func.count(LogEntry.id).label('count')
-    ).group_by(LogEntry.url_cat)
-    
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
+    return jsonify(_top_categories(file_uuid, limit)), 200
+
+
+def _top_categories(file_uuid, limit):
+    """Build the /top-categories payload, optionally for one log file."""
+    if file_uuid and has_rollups(file_uuid):
+        results = [
+            (name, count, percentage)
+            for name, count, _, percentage in load_top_n(file_uuid, 'url_cat', limit)
+        ]
+    else:
+        count = func.count().label('count')
+        query = LogEntry.query.with_entities(
+            LogEntry.url_cat,
+            count,
+            percent_of_total(func.count()).label('percentage')
+        ).group_by(LogEntry.url_cat)
+        
+        if file_uuid:
             query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
-    
-    results = query.order_by(func.count(LogEntry.id).desc()).limit(limit).all()
-    total = sum(r.count for r in results)
+        
+        # ORDER BY the output column rather than re-stating the aggregate
+        results = query.order_by(count.desc()).limit(limit).all()
     
-    categories = []
-    for name, count in results:
-        categories.append({
+    categories = [
+        {
             'name': name or 'Unknown',
             'count': count,
-            'percentage': (count / total * 100) if total > 0 else 0
-        })
+            'percentage': percentage or 0
+        }
+        for name, count, percentage in results
+    ]
     
-    return jsonify({'categories': categories}), 200
+    return {'categories': categories}
 
 
 @dashboard_bp.route('/top-domains', methods=['GET'])
+@cached_response
 def get_top_domains():
     """Get top domains."""
-    # Validate authentication
-    get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     limit = request.args.get('limit', 10, type=int)
-    
-    query = LogEntry.query.with_entities(
-        LogEntry.domain,
-        func.count(LogEntry.id).label('count'),
-        func.sum(func.cast(LogEntry.action == 'Blocked', db.Integer)).label('blocked_count')
-    ).group_by(LogEntry.domain)
-    
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
+    return jsonify(_top_domains(file_uuid, limit)), 200
+
+
+def _top_domains(file_uuid, limit):
+    """Build the /top-domains payload, optionally for one log file."""
+    if file_uuid and has_rollups(file_uuid):
+        results = [row[:3] for row in load_top_n(file_uuid, 'domain', limit)]
+    else:
+        count = func.count().label('count')
+        query = LogEntry.query.with_entities(
+            LogEntry.domain,
+            count,
+            func.count().filter(LogEntry.action == 'Blocked').label('blocked_count')
+        ).group_by(LogEntry.domain)
+        
+        if file_uuid:
             query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
-    
-    results = query.order_by(func.count(LogEntry.id).desc()).limit(limit).all()
+        
+        results = query.order_by(count.desc()).limit(limit).all()
     
     domains = []
     for domain, count, blocked_count in results:
@@ -364,73 +391,143 @@ def get_top_domains():
             'blocked_count': blocked_count or 0
         })
     
-    return jsonify({'domains': domains}), 200
+    return {'domains': domains}
 
 
 @dashboard_bp.route('/top-users', methods=['GET'])
+@cached_response
 def get_top_users():
-    # Validate authentication
-    get_user_id_from_kong()
     """Get top users by request count."""
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     limit = request.args.get('limit', 10, type=int)
-    
-    query = LogEntry.query.with_entities(
-        LogEntry.department,
-        func.count(LogEntry.id).label('request_count')
-    ).group_by(LogEntry.department)
-    
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
+    return jsonify(_top_users(file_uuid, limit)), 200
+
+
+def _top_users(file_uuid, limit):
+    """Build the /top-users payload, optionally for one log file."""
+    if file_uuid and has_rollups(file_uuid):
+        results = [(name, count) for name, count, _, _ in load_top_n(file_uuid, 'department', limit)]
+    else:
+        request_count = func.count().label('request_count')
+        query = LogEntry.query.with_entities(LogEntry.department, request_count).group_by(LogEntry.department)
+        
+        if file_uuid:
             query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
-    
-    results = query.order_by(func.count(LogEntry.id).desc()).limit(limit).all()
-    
-    users = []
-    for identifier, request_count in results:
-        # Get risk score if available
-        risk_score = 0
-        if log_file_id:
-            try:
-                file_uuid = uuid.UUID(log_file_id)
-                risk = UserRiskScore.query.filter_by(
-                    log_file_id=file_uuid,
-                    user_identifier=identifier or ''
-                ).first()
-                if risk:
-                    risk_score = risk.risk_score
-            except ValueError:
-                pass
         
-        users.append({
+        results = query.order_by(request_count.desc()).limit(limit).all()
+    
+    # Risk scores for all returned identifiers in one query
+    risk_map = {}
+    if file_uuid and results:
+        risk_map = dict(db.session.query(
+            UserRiskScore.user_identifier,
+            UserRiskScore.risk_score
+        ).filter(
+            UserRiskScore.log_file_id == file_uuid,
+            UserRiskScore.user_identifier.in_([identifier or '' for identifier, _ in results])
+        ).all())
+    
+    users = [
+        {
             'identifier': identifier or 'Unknown',
             'request_count': request_count,
-            'risk_score': risk_score
-        })
+            'risk_score': risk_map.get(identifier or '', 0)
+        }
+        for identifier, request_count in results
+    ]
+    
+    return {'users': users}
+
+
+@dashboard_bp.route('/summary', methods=['GET'])
+@cached_response
+def get_summary():
+    """
+    Get stats, the timeline and all top-N lists in one request.
+    
+    Each section runs concurrently on its own pooled connection, so latency
+    is that of the slowest query rather than the sum. Sections have the
+    same shape as the individual endpoints' responses.
+    """
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
+    limit = request.args.get('limit', 10, type=int)
+    bucket_minutes = request.args.get('bucket_minutes', 15, type=int)
+    hours = request.args.get('hours', 24, type=int)
+    
+    if bucket_minutes <= 0:
+        return jsonify({'error': 'bucket_minutes must be greater than 0'}), 400
     
-    return jsonify({'users': users}), 200
+    sections = {
+        'stats': (_stats, file_uuid),
+        'timeline': (_timeline, file_uuid, bucket_minutes, hours),
+        'top_categories': (_top_categories, file_uuid, limit),
+        'top_domains': (_top_domains, file_uuid, limit),
+        'top_users': (_top_users, file_uuid, limit),
+    }
+    app = current_app._get_current_object()
+    executor = _get_summary_executor()
+    futures = {
+        name: executor.submit(_run_section, app, *section)
+        for name, section in sections.items()
+    }
+    
+    return jsonify({name: future.result() for name, future in futures.items()}), 200
+
+
+def _get_summary_executor():
+    """Return the thread pool running /summary sections, creating it on first use."""
+    global _summary_executor
+    if _summary_executor is None:
+        with _summary_executor_lock:
+            if _summary_executor is None:
+                _summary_executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('DASHBOARD_SUMMARY_WORKERS', 8),
+                    thread_name_prefix='dashboard-summary'
+                )
+    return _summary_executor
+
+
+def _run_section(app, build, *args):
+    """Build one /summary section in its own app context (and DB session)."""
+    with app.app_context():
+        try:
+            return build(*args)
+        finally:
+            db.session.remove()
 
 
 @dashboard_bp.route('/recent-logs', methods=['GET'])
 def get_recent_logs():
     """Get recent log entries."""
-    # Validate authentication
-    get_user_id_from_kong()
-    log_file_id = request.args.get('log_file_id')
-    limit = request.args.get('limit', 10, type=int)
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
+    limit = page_limit(10, maximum=50)
+    cursor = request.args.get('cursor')
     
-    query = LogEntry.query.order_by(LogEntry.timestamp.desc())
+    # Plain rows in to_dict format; no ORM instances are built
+    query = select(*LogEntry.dict_columns())
     
-    if log_file_id:
+    if file_uuid:
+        query = query.where(LogEntry.log_file_id == file_uuid)
+    
+    # Keyset pagination: seek past the last (timestamp, id) returned
+    if cursor:
         try:
-            file_uuid = uuid.UUID(log_file_id)
-            query = query.filter(LogEntry.log_file_id == file_uuid)
+            last_timestamp, last_id = decode_cursor(cursor)
         except ValueError:
-            pass
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.where(
+            tuple_(LogEntry.timestamp, LogEntry.id) < tuple_(
+                literal(last_timestamp, LogEntry.timestamp.type),
+                literal(last_id, LogEntry.id.type)
+            )
+        )
     
-    entries = query.limit(limit).all()
+    rows, next_cursor, has_more = fetch_keyset_page(
+        query.order_by(LogEntry.timestamp.desc(), LogEntry.id.desc()), limit
+    )
     
-    return jsonify({'entries': [e.to_dict() for e in entries]}), 200
+    return jsonify({
+        'entries': [LogEntry.row_to_dict(row) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    }), 200
@@ -1,23 +1,60 @@
 """Log routes."""
+import codecs
+import gc
+import io
 import uuid
 import zipfile
-import io
+import multiprocessing
+import os
+import shutil
+import tempfile
 import threading
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import fields
+from operator import attrgetter
 from flask import Blueprint, request, jsonify, current_app
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, insert, literal, select, tuple_
 from models import LogFile, LogEntry, User
 from extensions import db
-from services.log_parser import ZscalerLogParser, LogParseError
+from services.log_parser import ZscalerLogParser, ParsedLogEntry
 from services.anomaly_detector import AnomalyDetector
-from services.risk_scorer import calculate_user_risk_scores
+from services.risk_scorer import accumulate_user_stats, risk_user_identifier, score_user_stats
+from services.timeline_summary import build_timeline_summary
+from services.dashboard_rollups import build_dashboard_rollups
 from models import UserRiskScore
 from utils.kong_helpers import get_user_id_from_kong
+from utils.pagination import decode_cursor, fetch_keyset_page, page_limit
+from utils.response_cache import invalidate_log_file
+from utils.sql_helpers import estimated_row_count
+from utils.time_helpers import parse_iso_datetime
+from utils.uuid_helpers import parse_log_file_id, parse_uuid
 
 logs_bp = Blueprint('logs', __name__)
 parser = ZscalerLogParser()
 detector = AnomalyDetector()
 
+# Parsed fields that are stored as-is in log_entries
+_PARSED_COLUMNS = tuple(
+    f.name for f in fields(ParsedLogEntry) if f.name in LogEntry.__table__.c
+)
+_get_parsed_columns = attrgetter(*_PARSED_COLUMNS)
+
+# Bytes copied per read when spooling uploads to disk and reading them back
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Bytes TextIOWrapper decodes per read when splitting log lines (its default
+# is 8 KiB); larger chunks cut per-read overhead, but past ~64 KiB the
+# decoded text no longer stays in cache
+LINE_DECODE_CHUNK_SIZE = 1 << 16
+
+_ingest_executor = None
+_ingest_slots = None  # Bounds uploads accepted but not yet processed
+_ingest_executor_lock = threading.Lock()
+
+# App used by _process_log_file_in_worker inside an ingest worker process
+_worker_app = None
+
 
 @logs_bp.route('/upload', methods=['POST'])
 def upload_log():
@@ -32,31 +69,52 @@ def upload_log():
     # Get user ID from Kong-injected header
     user_id = get_user_id_from_kong()
     
-    # Read file content into memory before returning response
-    file.seek(0)
-    file_content = file.read()
-    file_filename = file.filename
-    
-    # Create log file record
-    log_file = LogFile(
-        filename=file_filename,
-        uploaded_by=user_id,
-        status='processing'
-    )
-    db.session.add(log_file)
-    db.session.commit()
-    
-    log_file_id = log_file.id
-    
-    # Process file asynchronously in background thread
-    # Pass app context to thread
-    app = current_app._get_current_object()
-    thread = threading.Thread(
-        target=_process_log_file_async,
-        args=(app, log_file_id, file_content, file_filename),
-        daemon=True
-    )
-    thread.start()
+    # Turn uploads away while the ingest queue is full, before spooling them
+    executor, slots = _get_ingest_executor()
+    if not slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many uploads are being processed. Try again later.'}), 429
+    
+    file_path = None
+    try:
+        # Spool the upload to disk in chunks before returning the response, so
+        # the file is never held in memory; the background worker deletes it
+        file.seek(0)
+        file_path = _save_upload(file)
+        file_filename = file.filename
+        
+        # Create log file record
+        log_file = LogFile(
+            filename=file_filename,
+            uploaded_by=user_id,
+            status='processing'
+        )
+        db.session.add(log_file)
+        db.session.commit()
+        log_file_id = log_file.id
+        
+        # Process file in the background: in a worker process when configured,
+        # so parsing doesn't compete with request handling for the GIL
+        app = current_app._get_current_object()
+        if isinstance(executor, ProcessPoolExecutor):
+            future = executor.submit(
+                _process_log_file_in_worker, log_file_id, file_path, file_filename
+            )
+            future.add_done_callback(
+                lambda done: _finish_in_app(app, executor, done, log_file_id, file_path)
+            )
+        else:
+            future = executor.submit(
+                _process_log_file_async, app, log_file_id, file_path, file_filename
+            )
+    except Exception as e:
+        slots.release()
+        if file_path:
+            os.unlink(file_path)
+        if isinstance(e, BrokenProcessPool):
+            # A worker died before this upload's done callback could replace the pool
+            _reset_ingest_executor(executor)
+        raise
+    future.add_done_callback(lambda _: slots.release())
     
     # Return immediately with 200 status
     return jsonify({
@@ -66,22 +124,29 @@ def upload_log():
     }), 200
 
 
-def _process_log_file_async(app, log_file_id: uuid.UUID, file_content: bytes, filename: str):
+def _save_upload(file) -> str:
+    """Copy an uploaded file to a temporary file in UPLOAD_DIR and return its path."""
+    with tempfile.NamedTemporaryFile(
+        delete=False, dir=current_app.config.get('UPLOAD_DIR'), suffix='.upload'
+    ) as tmp:
+        shutil.copyfileobj(file.stream, tmp, length=UPLOAD_CHUNK_SIZE)
+    return tmp.name
+
+
+def _process_log_file_async(app, log_file_id: uuid.UUID, file_path: str, filename: str):
     """Process log file asynchronously in background thread.
     
     Args:
         app: Flask application instance (for app context)
         log_file_id: UUID of the log file record
-        file_content: File content as bytes
+        file_path: Path of the spooled upload; deleted once processed
         filename: Original filename
     """
     with app.app_context():
-        # Create a file-like object from bytes
-        file_obj = io.BytesIO(file_content)
-        file_obj.filename = filename
-        
         try:
-            _process_log_file(log_file_id, file_obj)
+            with open(file_path, 'rb', buffering=UPLOAD_CHUNK_SIZE) as file_obj:
+                file_obj.filename = filename
+                _process_log_file(log_file_id, file_obj)
         except Exception as e:
             # Update status to failed
             log_file = LogFile.query.get(log_file_id)
@@ -90,6 +155,97 @@ def _process_log_file_async(app, log_file_id: uuid.UUID, file_content: bytes, fi
                 db.session.commit()
             # Log error for debugging
             app.logger.error(f"Error processing log file {log_file_id}: {str(e)}", exc_info=True)
+        finally:
+            os.unlink(file_path)
+
+
+def _get_ingest_executor():
+    """
+    Return the shared ingest executor and its pending-upload semaphore,
+    creating them on first use.
+    
+    Uploads run in LOG_INGEST_PROCESSES worker processes, or in
+    LOG_INGEST_THREADS threads when that is 0. At most LOG_INGEST_MAX_PENDING
+    uploads (twice the workers by default) may be running or queued.
+    """
+    global _ingest_executor, _ingest_slots
+    if _ingest_executor is None:
+        with _ingest_executor_lock:
+            if _ingest_executor is None:
+                config = current_app.config
+                processes = config.get('LOG_INGEST_PROCESSES', 0)
+                if processes > 0:
+                    # Spawned, not forked, so workers don't inherit this
+                    # process's threads or pooled DB connections
+                    executor = ProcessPoolExecutor(
+                        max_workers=processes,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_ingest_worker,
+                        initargs=(config.get('CONFIG_NAME'),)
+                    )
+                    workers = processes
+                else:
+                    workers = config.get('LOG_INGEST_THREADS', 2)
+                    executor = ThreadPoolExecutor(
+                        max_workers=workers,
+                        thread_name_prefix='log-ingest'
+                    )
+                _ingest_slots = threading.BoundedSemaphore(
+                    config.get('LOG_INGEST_MAX_PENDING') or 2 * workers
+                )
+                _ingest_executor = executor
+    return _ingest_executor, _ingest_slots
+
+
+def _init_ingest_worker(config_name):
+    """Create the app an ingest worker process runs uploads in."""
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(config_name)
+    # The app, its extensions and imported modules live as long as the
+    # worker; move them out of the collector's generations so full
+    # collections during ingest only traverse per-upload objects
+    gc.collect()
+    gc.freeze()
+
+
+def _process_log_file_in_worker(log_file_id: uuid.UUID, file_path: str, filename: str):
+    """Process an uploaded log file inside an ingest worker process."""
+    _process_log_file_async(_worker_app, log_file_id, file_path, filename)
+
+
+def _finish_in_app(app, executor, future, log_file_id: uuid.UUID, file_path: str):
+    """
+    Wrap up, in this process, an upload a worker process was given.
+    
+    If a worker died (e.g. OOM-killed) the upload never got to mark its file
+    failed or delete its spooled copy, so both happen here; the pool is
+    broken for good, so it is also dropped for the next upload to replace.
+    """
+    with app.app_context():
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            log_file = db.session.get(LogFile, log_file_id)
+            if log_file and log_file.status == 'processing':
+                log_file.status = 'failed'
+                db.session.commit()
+            app.logger.error(f"Ingest worker died processing log file {log_file_id}")
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
+            _reset_ingest_executor(executor)
+        # Drop this process's cached responses for the file
+        invalidate_log_file(log_file_id)
+
+
+def _reset_ingest_executor(executor):
+    """Drop a broken ingest executor, unless it was already replaced."""
+    global _ingest_executor, _ingest_slots
+    with _ingest_executor_lock:
+        if _ingest_executor is executor:
+            _ingest_executor = None
+            _ingest_slots = None
+    executor.shutdown(wait=False)
 
 
 def _process_log_file(log_file_id: uuid.UUID, file):
@@ -97,6 +253,7 @@ def _process_log_file(log_file_id: uuid.UUID, file):
     
     Supports both regular files and zip archives. If zip, extracts and processes all files.
     Processes entries in batches of 1000 for memory efficiency.
+    The file must be positioned at its start; regular files are read in one pass.
     
     Note: This function assumes it's called within an app context.
     """
@@ -105,85 +262,51 @@ def _process_log_file(log_file_id: uuid.UUID, file):
         return
     
     BATCH_SIZE = 1000
+    PROGRESS_EVERY_BATCHES = 10
     parsed_batch = []
     recent_entries_by_ip = {}  # For burst detection
     all_timestamps = []  # Track timestamps for date range calculation
+    user_stats = {}  # Risk counters per user, so entries needn't be re-read
     total_processed = 0
+    batches_processed = 0
     
     def process_batch(batch_entries):
         """Process a batch of parsed entries and insert into DB."""
-        nonlocal total_processed
+        nonlocal total_processed, batches_processed
         
         if not batch_entries:
             return
         
-        log_entries = []
-        for parsed in batch_entries:
-            # Get recent entries for burst detection
-            recent = recent_entries_by_ip.get(parsed.client_ip, [])
-            anomaly_result = detector.detect_anomalies(parsed, recent)
-            
-            # Create LogEntry
-            log_entry = LogEntry(
-                log_file_id=log_file_id,
-                timestamp=parsed.timestamp,
-                location=parsed.location,
-                protocol=parsed.protocol,
-                url=parsed.url,
-                domain=parsed.domain,
-                action=parsed.action,
-                app_name=parsed.app_name,
-                app_class=parsed.app_class,
-                throttle_req_size=parsed.throttle_req_size,
-                throttle_resp_size=parsed.throttle_resp_size,
-                req_size=parsed.req_size,
-                resp_size=parsed.resp_size,
-                url_class=parsed.url_class,
-                url_supercat=parsed.url_supercat,
-                url_cat=parsed.url_cat,
-                dlp_dict=parsed.dlp_dict,
-                dlp_eng=parsed.dlp_eng,
-                dlp_hits=parsed.dlp_hits,
-                file_class=parsed.file_class,
-                file_type=parsed.file_type,
-                location2=parsed.location2,
-                department=parsed.department,
-                client_ip=parsed.client_ip,
-                server_ip=parsed.server_ip,
-                http_method=parsed.http_method,
-                http_status=parsed.http_status,
-                user_agent=parsed.user_agent,
-                threat_category=parsed.threat_category,
-                fw_filter=parsed.fw_filter,
-                fw_rule=parsed.fw_rule,
-                policy_type=parsed.policy_type,
-                reason=parsed.reason,
-                is_anomalous=anomaly_result.is_anomalous,
-                anomaly_type=anomaly_result.anomaly_type,
-                anomaly_reason=anomaly_result.reason,
-                anomaly_confidence=anomaly_result.confidence
-            )
-            log_entries.append(log_entry)
-            
-            # Update recent entries for burst detection
-            if parsed.client_ip not in recent_entries_by_ip:
-                recent_entries_by_ip[parsed.client_ip] = []
-            recent_entries_by_ip[parsed.client_ip].append(parsed)
-            # Keep only last 20 entries per IP
-            if len(recent_entries_by_ip[parsed.client_ip]) > 20:
-                recent_entries_by_ip[parsed.client_ip].pop(0)
+        anomaly_results = detector.detect_anomalies_batch(batch_entries, recent_entries_by_ip)
+        
+        # Insert plain rows with one executemany instead of building ORM objects
+        rows = []
+        risk_records = []
+        for parsed, anomaly_result in zip(batch_entries, anomaly_results):
+            row = dict(zip(_PARSED_COLUMNS, _get_parsed_columns(parsed)))
+            row['log_file_id'] = log_file_id
+            row['is_anomalous'] = anomaly_result.is_anomalous
+            row['anomaly_type'] = anomaly_result.anomaly_type
+            row['anomaly_reason'] = anomaly_result.reason
+            row['anomaly_confidence'] = anomaly_result.confidence
+            rows.append(row)
+            risk_records.append((
+                risk_user_identifier(parsed.department, parsed.client_ip),
+                anomaly_result.is_anomalous, anomaly_result.anomaly_type, parsed.action
+            ))
             
             # Track timestamps for date range
             all_timestamps.append(parsed.timestamp)
         
-        # Bulk insert batch
-        db.session.bulk_save_objects(log_entries)
-        db.session.commit()
+        db.session.execute(insert(LogEntry), rows)
+        accumulate_user_stats(user_stats, risk_records)
         
-        total_processed += len(log_entries)
+        total_processed += len(rows)
+        batches_processed += 1
         
-        # Update progress periodically
-        log_file.total_entries = total_processed
+        # Update progress every few batches, in the same commit as the rows
+        if batches_processed % PROGRESS_EVERY_BATCHES == 0:
+            log_file.total_entries = total_processed
         db.session.commit()
     
     try:
@@ -192,111 +315,65 @@ def _process_log_file(log_file_id: uuid.UUID, file):
         has_zip_extension = filename.endswith('.zip') if filename else False
         
         # Check file content to see if it's actually a zip file
-        file.seek(0)
-        file_start = file.read(4)
-        file.seek(0)
-        is_zip_file = file_start[:2] == b'PK'  # ZIP files start with PK (PKZIP signature)
+        is_zip_file = _peek_magic(file)[:2] == b'PK'  # ZIP files start with PK (PKZIP signature)
         
         is_zip = has_zip_extension or is_zip_file
         
         if is_zip:
-            # Process zip file: extract and process all files
-            file.seek(0)  # Reset file pointer
-            zip_data = file.read()
-            zip_buffer = io.BytesIO(zip_data)
-            
+            # Read the archive in place and stream each member, so neither the
+            # archive nor a whole member is copied into memory
             try:
-                zip_ref = zipfile.ZipFile(zip_buffer, 'r')
+                zip_ref = zipfile.ZipFile(file, 'r')
             except zipfile.BadZipFile:
                 raise ValueError("Invalid or corrupted zip file")
             
             with zip_ref:
-                # Get list of files in zip
-                file_list = zip_ref.namelist()
-                
-                # Process each file in the zip
-                for zip_file_name in file_list:
+                for member in zip_ref.infolist():
                     # Skip directories and non-log files
-                    if zip_file_name.endswith('/'):
+                    if member.is_dir():
                         continue
                     
                     # Only process .csv, .txt, .log files
-                    if not any(zip_file_name.lower().endswith(ext) for ext in ['.csv', '.txt', '.log']):
+                    if not member.filename.lower().endswith(('.csv', '.txt', '.log')):
                         continue
                     
                     try:
-                        # Read file from zip
-                        file_content = zip_ref.read(zip_file_name)
-                        
-                        # Try to decode as UTF-8 first, fallback to latin-1
-                        try:
-                            file_text = file_content.decode('utf-8')
-                        except UnicodeDecodeError:
-                            file_text = file_content.decode('latin-1', errors='ignore')
-                        
-                        # Parse file line by line in batches
-                        for line_num, line in enumerate(file_text.splitlines(), 1):
-                            line = line.strip()
-                            if not line:
-                                continue
-                            
-                            try:
-                                parsed = parser.parse_line(line)
+                        with zip_ref.open(member) as member_file:
+                            for parsed in parser.parse_lines(_iter_log_lines(member_file)):
                                 parsed_batch.append(parsed)
                                 
                                 # Process batch when it reaches BATCH_SIZE
                                 if len(parsed_batch) >= BATCH_SIZE:
                                     process_batch(parsed_batch)
                                     parsed_batch = []
-                            except LogParseError:
-                                continue  # Skip invalid lines
                     except Exception as e:
                         # Log error but continue processing other files
-                        print(f"Error processing {zip_file_name} in zip: {str(e)}")
+                        current_app.logger.warning("Error processing %s in zip: %s", member.filename, e)
                         continue
         else:
-            # Process regular file line by line
-            file.seek(0)  # Reset file pointer
-            for line_num, line in enumerate(file, 1):
-                try:
-                    line = line.decode('utf-8').strip()
-                except UnicodeDecodeError:
-                    # Try other encodings
-                    try:
-                        line = line.decode('latin-1').strip()
-                    except:
-                        continue
-                
-                if not line:
-                    continue
+            # Process regular file line by line, in a single pass from the start
+            # Invalid lines are skipped by the parser
+            for parsed in parser.parse_lines(_iter_log_lines(file)):
+                parsed_batch.append(parsed)
                 
-                try:
-                    parsed = parser.parse_line(line)
-                    parsed_batch.append(parsed)
-                    
-                    # Process batch when it reaches BATCH_SIZE
-                    if len(parsed_batch) >= BATCH_SIZE:
-                        process_batch(parsed_batch)
-                        parsed_batch = []
-                except LogParseError:
-                    continue  # Skip invalid lines
+                # Process batch when it reaches BATCH_SIZE
+                if len(parsed_batch) >= BATCH_SIZE:
+                    process_batch(parsed_batch)
+                    parsed_batch = []
         
         # Process remaining entries in the last batch
         if parsed_batch:
             process_batch(parsed_batch)
+        log_file.total_entries = total_processed
         
         # Calculate date range from all timestamps
         if all_timestamps:
             log_file.date_range_start = min(all_timestamps)
             log_file.date_range_end = max(all_timestamps)
         
-        # Calculate risk scores - need to query all entries for this log file
-        # Refresh log_file to get updated total_entries
-        db.session.refresh(log_file)
-        log_entries_for_risk = LogEntry.query.filter_by(log_file_id=log_file_id).all()
-        
-        if log_entries_for_risk:
-            risk_scores = calculate_user_risk_scores(log_file_id, log_entries_for_risk)
+        # Calculate risk scores from the counters gathered while inserting
+        if user_stats:
+            risk_scores = score_user_stats(user_stats)
             for user_id, score_data in risk_scores.items():
                 risk_score = UserRiskScore(
                     log_file_id=log_file_id,
@@ -309,8 +386,12 @@ def _process_log_file(log_file_id: uuid.UUID, file):
                 )
                 db.session.add(risk_score)
         
+        build_timeline_summary(log_file_id)
+        build_dashboard_rollups(log_file_id)
+        
         log_file.status = 'completed'
         db.session.commit()
+        invalidate_log_file(log_file_id)
         
     except Exception as e:
         log_file.status = 'failed'
@@ -318,6 +399,45 @@ def _process_log_file(log_file_id: uuid.UUID, file):
         raise
 
 
+def _peek_magic(file) -> bytes:
+    """Return the first bytes of a file that's at its start, leaving it there."""
+    peek = getattr(file, 'peek', None)
+    if peek is not None:
+        # Buffered files fill their buffer once; the read loop reuses it
+        return peek(4)[:4]
+    magic = file.read(4)
+    file.seek(0)
+    return magic
+
+
+def _decode_as_latin1(error: UnicodeDecodeError):
+    """Codec error handler decoding bytes that aren't valid UTF-8 as latin-1."""
+    return error.object[error.start:error.end].decode('latin-1'), error.end
+
+
+codecs.register_error('log_latin1_fallback', _decode_as_latin1)
+
+
+def _iter_log_lines(stream):
+    """
+    Yield the stripped, non-empty lines of a binary stream.
+    
+    The stream is decoded as UTF-8 in LINE_DECODE_CHUNK_SIZE chunks, with
+    lines split by TextIOWrapper in C; bytes that aren't valid UTF-8 are read
+    as latin-1.
+    The stream is left open.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', errors='log_latin1_fallback')
+    text._CHUNK_SIZE = LINE_DECODE_CHUNK_SIZE
+    try:
+        for line in text:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        text.detach()
+
+
 @logs_bp.route('/files', methods=['GET'])
 def list_log_files():
     """List uploaded log files."""
@@ -343,9 +463,8 @@ def get_log_file(file_id):
     """Get log file details."""
     # Validate authentication
     get_user_id_from_kong()
-    try:
-        file_uuid = uuid.UUID(file_id)
-    except ValueError:
+    file_uuid = parse_uuid(file_id)
+    if file_uuid is None:
         return jsonify({'error': 'Invalid file ID'}), 400
     
     log_file = LogFile.query.get(file_uuid)
@@ -360,9 +479,8 @@ def preview_log_file(file_id):
     """Get preview of log file (first N lines)."""
     # Validate authentication
     get_user_id_from_kong()
-    try:
-        file_uuid = uuid.UUID(file_id)
-    except ValueError:
+    file_uuid = parse_uuid(file_id)
+    if file_uuid is None:
         return jsonify({'error': 'Invalid file ID'}), 400
     
     log_file = LogFile.query.get(file_uuid)
@@ -385,11 +503,16 @@ def preview_log_file(file_id):
 
 @logs_bp.route('/entries', methods=['GET'])
 def list_log_entries():
-    """List log entries with filters."""
+    """
+    List log entries with filters, newest first.
+    
+    Pass the returned next_cursor as ?cursor= to seek to the next page; this
+    skips both the OFFSET scan and the total count. ?page= is still accepted.
+    """
     # Validate authentication
     get_user_id_from_kong()
     # Parse filters
-    log_file_id = request.args.get('log_file_id')
+    file_uuid = parse_log_file_id(request.args.get('log_file_id'))
     start_time = request.args.get('start_time')
     end_time = request.args.get('end_time')
     action = request.args.get('action')
@@ -400,31 +523,22 @@ def list_log_entries():
     domain = request.args.get('domain')
     search = request.args.get('search')  # General text search across multiple columns
     page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 50, type=int)
+    limit = page_limit(50)
+    cursor = request.args.get('cursor')
     
-    # Build query
-    query = LogEntry.query
+    # Build query over plain rows in to_dict format; no ORM instances are built
+    query = select(*LogEntry.dict_columns())
     
-    if log_file_id:
-        try:
-            file_uuid = uuid.UUID(log_file_id)
-            query = query.filter(LogEntry.log_file_id == file_uuid)
-        except ValueError:
-            pass
+    if file_uuid:
+        query = query.filter(LogEntry.log_file_id == file_uuid)
     
-    if start_time:
-        try:
-            start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            query = query.filter(LogEntry.timestamp >= start_dt)
-        except ValueError:
-            pass
+    start_dt = parse_iso_datetime(start_time)
+    if start_dt is not None:
+        query = query.filter(LogEntry.timestamp >= start_dt)
     
-    if end_time:
-        try:
-            end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-            query = query.filter(LogEntry.timestamp <= end_dt)
-        except ValueError:
-            pass
+    end_dt = parse_iso_datetime(end_time)
+    if end_dt is not None:
+        query = query.filter(LogEntry.timestamp <= end_dt)
     
     if action:
         query = query.filter(LogEntry.action == action)
@@ -468,17 +582,62 @@ def list_log_entries():
             )
         )
     
-    # Paginate
-    entries = query.order_by(LogEntry.timestamp.desc()).paginate(
-        page=page, per_page=limit, error_out=False
-    )
+    filtered = any((
+        start_time, end_time, action, category, threat_category,
+        user_identifier, is_anomalous is not None, domain, search
+    ))
+    ordered = query.order_by(LogEntry.timestamp.desc(), LogEntry.id.desc())
     
-    return jsonify({
-        'entries': [e.to_dict() for e in entries.items],
-        'total': entries.total,
-        'page': page,
+    # Keyset pagination: seek past the last (timestamp, id) returned
+    if cursor:
+        try:
+            last_timestamp, last_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        ordered = ordered.where(
+            tuple_(LogEntry.timestamp, LogEntry.id) < tuple_(
+                literal(last_timestamp, LogEntry.timestamp.type),
+                literal(last_id, LogEntry.id.type)
+            )
+        )
+    else:
+        ordered = ordered.offset((max(page, 1) - 1) * limit)
+        total = _count_log_entries(query, file_uuid, filtered)
+    
+    rows, next_cursor, has_more = fetch_keyset_page(ordered, limit)
+    
+    response = {
+        'entries': [LogEntry.row_to_dict(row) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': has_more,
         'limit': limit
-    }), 200
+    }
+    if not cursor:
+        response['total'] = total
+        response['page'] = page
+    return jsonify(response), 200
+
+
+def _count_log_entries(query, file_uuid, filtered: bool):
+    """
+    Count the entries a list_log_entries query matches, as cheaply as possible.
+    
+    A whole log file's count is its total_entries; the whole table's is the
+    planner's estimate where available. Anything else is counted exactly.
+    """
+    if not filtered:
+        if file_uuid:
+            total = db.session.execute(
+                select(LogFile.total_entries).where(LogFile.id == file_uuid)
+            ).scalar()
+            return total or 0
+        estimate = estimated_row_count(LogEntry.__tablename__)
+        if estimate is not None:
+            return estimate
+    
+    return db.session.execute(
+        select(func.count()).select_from(query.subquery())
+    ).scalar()
 
 
 @logs_bp.route('/entries/<entry_id>', methods=['GET'])
@@ -486,9 +645,8 @@ def get_log_entry(entry_id):
     """Get single log entry."""
     # Validate authentication
     get_user_id_from_kong()
-    try:
-        entry_uuid = uuid.UUID(entry_id)
-    except ValueError:
+    entry_uuid = parse_uuid(entry_id)
+    if entry_uuid is None:
         return jsonify({'error': 'Invalid entry ID'}), 400
     
     entry = LogEntry.query.get(entry_uuid)
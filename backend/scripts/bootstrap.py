@@ -1,22 +1,32 @@
 """Database bootstrap script."""
+from sqlalchemy.dialects import postgresql, sqlite
 from models import User
 from extensions import db
+from utils.security import hash_password
+
+# ON CONFLICT-capable INSERT constructs by dialect name
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
 
 
 def bootstrap_test_user():
     """Create test user if it doesn't exist.
     
+    Issues a single INSERT ... ON CONFLICT (email) DO NOTHING, so concurrent
+    callers can't race between checking for the user and creating it.
+    
     Returns:
         bool: True if user was created, False if user already exists.
     """
-    # Check if user already exists
-    existing_user = User.query.filter_by(email='test@example.com').first()
-    if existing_user:
-        return False
+    insert = _UPSERT_INSERTS[db.engine.dialect.name]
+    stmt = insert(User).values(
+        email='test@example.com',
+        password_hash=hash_password('testpassword123'),
+        jwt_version=0
+    ).on_conflict_do_nothing(index_elements=['email']).returning(User.id)
     
-    # Create test user
-    user = User(email='test@example.com', password='testpassword123')
-    db.session.add(user)
+    created = db.session.execute(stmt).first() is not None
     db.session.commit()
-    return True
-
+    return created
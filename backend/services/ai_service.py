@@ -1,9 +1,13 @@
 """AI service for OpenAI integration."""
 import os
 from typing import Dict, Any
+from sqlalchemy import func, select
 from models import LogEntry, LogFile
 from extensions import db
 
+# Entries returned alongside an investigation answer
+SUPPORTING_ENTRY_LIMIT = 5
+
 
 class AIService:
     """Service for AI/LLM integration."""
@@ -19,11 +23,14 @@ class AIService:
         if not log_file:
             raise ValueError("Log file not found")
         
-        # Get statistics
-        entries = LogEntry.query.filter_by(log_file_id=log_file_id).all()
-        total_requests = len(entries)
-        blocked_events = sum(1 for e in entries if e.action == 'Blocked')
-        malicious_urls = sum(1 for e in entries if e.is_anomalous)
+        # Get statistics in one aggregate query rather than loading every entry
+        total_requests, blocked_events, malicious_urls = db.session.execute(
+            select(
+                func.count(),
+                func.count().filter(LogEntry.action == 'Blocked'),
+                func.count().filter(LogEntry.is_anomalous == True)
+            ).select_from(LogEntry).where(LogEntry.log_file_id == log_file_id)
+        ).one()
         
         # Generate summary (simplified - would call OpenAI in production)
         summary_text = f"""
@@ -81,25 +88,34 @@ class AIService:
         # Simple pattern matching (would use OpenAI in production)
         question_lower = question.lower()
         
-        entries = LogEntry.query.filter_by(log_file_id=log_file_id).all()
+        # Filter, count and limit in the database; at most
+        # SUPPORTING_ENTRY_LIMIT entries are loaded
+        conds = [LogEntry.log_file_id == log_file_id]
         
         if 'phishing' in question_lower or 'malicious' in question_lower:
-            relevant = [e for e in entries if e.is_anomalous and 'malicious' in str(e.anomaly_type).lower()]
-            answer = f"Found {len(relevant)} malicious/phishing entries. Review the anomalous entries for details."
+            conds += [LogEntry.is_anomalous == True, LogEntry.anomaly_type.ilike('%malicious%')]
+            answer = f"Found {self._count_entries(conds)} malicious/phishing entries. Review the anomalous entries for details."
         elif 'blocked' in question_lower:
-            relevant = [e for e in entries if e.action == 'Blocked']
-            answer = f"Found {len(relevant)} blocked requests. These were blocked by the firewall policy."
+            conds.append(LogEntry.action == 'Blocked')
+            answer = f"Found {self._count_entries(conds)} blocked requests. These were blocked by the firewall policy."
         elif 'user' in question_lower:
             # Extract user from question if possible
-            relevant = entries[:10]  # Simplified
             answer = f"Found user activity. Review the log entries for user behavior patterns."
         else:
             answer = "Based on the log data, I recommend reviewing the dashboard statistics and investigating any anomalous entries."
-            relevant = entries[:5]
+        
+        relevant = db.session.execute(
+            select(*LogEntry.dict_columns()).where(*conds).limit(SUPPORTING_ENTRY_LIMIT)
+        ).all()
         
         return {
             'answer': answer,
-            'supporting_entries': [e.to_dict() for e in relevant[:5]],
+            'supporting_entries': [LogEntry.row_to_dict(row) for row in relevant],
             'query_used': 'pattern_matching'  # Would be actual query in production
         }
-
+    
+    def _count_entries(self, conds) -> int:
+        """Count the log entries matching a list of filter conditions."""
+        return db.session.execute(
+            select(func.count()).select_from(LogEntry).where(*conds)
+        ).scalar()
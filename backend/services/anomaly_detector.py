@@ -1,9 +1,15 @@
 """Anomaly detection service for log entries."""
+import re
+import sys
+from collections import deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Deque, Dict, Iterable, List, Optional
 from services.log_parser import ParsedLogEntry
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+
 
 @dataclass
 class AnomalyResult:
@@ -42,10 +48,23 @@ class AnomalyDetector:
     BURST_WINDOW_MINUTES = 5
     BURST_THRESHOLD = 10
     
+    # Entries kept per client IP for burst detection
+    RECENT_ENTRIES_PER_IP = 20
+    
+    def __init__(self):
+        self._burst_window = timedelta(minutes=self.BURST_WINDOW_MINUTES)
+        self._burst_window_seconds = self.BURST_WINDOW_MINUTES * 60
+        # Interned like the parser's url_cat values, so lookups match on identity
+        self._risky_categories = frozenset(map(sys.intern, self.RISKY_CATEGORIES))
+        # Finds (and names) any unusual user agent pattern in one scan
+        self._unusual_ua_re = re.compile(
+            '|'.join(re.escape(pattern) for pattern in self.UNUSUAL_UA_PATTERNS)
+        )
+    
     def detect_anomalies(
         self, 
         entry: ParsedLogEntry, 
-        recent_entries: List[ParsedLogEntry]
+        recent_entries: Iterable[ParsedLogEntry]
     ) -> AnomalyResult:
         """
         Detect anomalies in a log entry.
@@ -57,88 +76,177 @@ class AnomalyDetector:
         Returns:
             AnomalyResult with detection results
         """
-        anomalies = []
+        return self._detect(entry, self._count_recent_blocked(entry, recent_entries))
+    
+    def _detect(self, entry: ParsedLogEntry, recent_blocked: int) -> AnomalyResult:
+        """
+        Detect anomalies in a log entry, given its count of recent blocked requests.
+        
+        Args:
+            entry: Current log entry to check
+            recent_blocked: Blocked requests from the same IP/user in the
+                burst window before this entry
+            
+        Returns:
+            AnomalyResult with detection results
+        """
+        # Checks run in descending confidence order, so the first hit is the
+        # highest-confidence anomaly
         
-        # Check malicious domain
+        # Check malicious domain (0.95)
         if entry.domain in self.MALICIOUS_DOMAINS:
-            anomalies.append(AnomalyResult(
+            return AnomalyResult(
                 is_anomalous=True,
                 anomaly_type='malicious_domain',
                 reason=f"Domain {entry.domain} is in malicious domains list",
                 confidence=0.95
-            ))
+            )
         
-        # Check risky category
-        if entry.url_cat in self.RISKY_CATEGORIES:
-            anomalies.append(AnomalyResult(
+        # Check burst of blocked requests (0.8)
+        burst_result = self._detect_burst_blocked(entry, recent_blocked)
+        if burst_result is not None:
+            return burst_result
+        
+        # Check risky category (0.7)
+        if entry.url_cat in self._risky_categories:
+            return AnomalyResult(
                 is_anomalous=True,
                 anomaly_type='risky_category',
                 reason=f"URL category '{entry.url_cat}' is considered risky",
                 confidence=0.7
-            ))
-        
-        # Check unusual user agent
-        if any(pattern in entry.user_agent for pattern in self.UNUSUAL_UA_PATTERNS):
-            pattern = next(p for p in self.UNUSUAL_UA_PATTERNS if p in entry.user_agent)
-            anomalies.append(AnomalyResult(
-                is_anomalous=True,
-                anomaly_type='unusual_ua',
-                reason=f"Unusual user agent detected: {pattern}",
-                confidence=0.6
-            ))
+            )
         
-        # Check large download
+        # Check large download (0.65)
         if entry.resp_size > self.LARGE_DOWNLOAD_THRESHOLD:
             size_mb = entry.resp_size / (1024 * 1024)
-            anomalies.append(AnomalyResult(
+            return AnomalyResult(
                 is_anomalous=True,
                 anomaly_type='large_download',
                 reason=f"Large download detected: {size_mb:.2f} MB",
                 confidence=0.65
-            ))
+            )
         
-        # Check burst of blocked requests
-        burst_result = self._detect_burst_blocked(entry, recent_entries)
-        if burst_result.is_anomalous:
-            anomalies.append(burst_result)
+        # Check unusual user agent (0.6)
+        ua_match = self._unusual_ua_re.search(entry.user_agent)
+        if ua_match:
+            return AnomalyResult(
+                is_anomalous=True,
+                anomaly_type='unusual_ua',
+                reason=f"Unusual user agent detected: {ua_match.group(0)}",
+                confidence=0.6
+            )
         
-        # Return highest confidence anomaly, or no anomaly
-        if not anomalies:
-            return AnomalyResult(is_anomalous=False)
+        return AnomalyResult(is_anomalous=False)
+    
+    def detect_anomalies_batch(
+        self,
+        entries: List[ParsedLogEntry],
+        recent_entries_by_ip: Dict[str, Deque[Optional[int]]]
+    ) -> List[AnomalyResult]:
+        """
+        Detect anomalies in a batch of log entries, in order.
+        
+        Each check is first run as a cheap membership test over the whole
+        batch, with the user agent check evaluated once per distinct user
+        agent; only entries that trip one (or are blocked, and so may be part
+        of a burst) go through the full detection.
+        
+        The burst window keeps only what burst detection reads: the
+        timestamp of each recent blocked entry, as integer seconds since the
+        epoch so the window check is an int comparison, and None for other
+        entries.
+        Windows are per client IP, so the IP/department match is implied.
+        Blocked entries are only counted against the window once it holds
+        enough of them to make a burst.
+        
+        Args:
+            entries: Log entries to check, in file order
+            recent_entries_by_ip: Bounded deques of recent blocked timestamps
+                per client IP; updated with this batch so the next batch sees it
+            
+        Returns:
+            One AnomalyResult per entry
+        """
+        malicious_domains = self.MALICIOUS_DOMAINS
+        risky_categories = self._risky_categories
+        # Batches repeat a handful of user agents, so run the regex once per
+        # distinct value rather than once per entry
+        ua_search = self._unusual_ua_re.search
+        unusual_uas = {
+            ua for ua in {entry.user_agent for entry in entries} if ua_search(ua)
+        }
+        large_threshold = self.LARGE_DOWNLOAD_THRESHOLD
+        window_seconds = self._burst_window_seconds
+        burst_min_recent = self.BURST_THRESHOLD - 1
+        keep = self.RECENT_ENTRIES_PER_IP
+        normal = AnomalyResult(is_anomalous=False)
+        
+        results = []
+        for entry in entries:
+            recent = recent_entries_by_ip.get(entry.client_ip)
+            if recent is None:
+                recent = recent_entries_by_ip[entry.client_ip] = deque(maxlen=keep)
+            
+            blocked_at = None
+            if entry.action == "Blocked":
+                blocked_at = (entry.timestamp - _EPOCH) // _ONE_SECOND
+                if len(recent) - recent.count(None) >= burst_min_recent:
+                    window_start = blocked_at - window_seconds
+                    recent_blocked = sum(1 for ts in recent if ts is not None and ts >= window_start)
+                else:
+                    # Too few blocked entries for a burst even before the
+                    # window check, so skip counting them
+                    recent_blocked = 0
+                results.append(self._detect(entry, recent_blocked))
+            elif (
+                entry.domain in malicious_domains
+                or entry.url_cat in risky_categories
+                or entry.resp_size > large_threshold
+                or entry.user_agent in unusual_uas
+            ):
+                results.append(self._detect(entry, 0))
+            else:
+                results.append(normal)
+            
+            # Evicts the oldest entry once full
+            recent.append(blocked_at)
         
-        # Sort by confidence (descending) and return highest
-        anomalies.sort(key=lambda x: x.confidence, reverse=True)
-        return anomalies[0]
+        return results
+    
+    def _count_recent_blocked(
+        self,
+        entry: ParsedLogEntry,
+        recent_entries: Iterable[ParsedLogEntry]
+    ) -> int:
+        """Count recent blocked entries from the same IP/user within the burst window."""
+        window_start = entry.timestamp - self._burst_window
+        return sum(
+            1 for e in recent_entries
+            if e.timestamp >= window_start
+            and e.action == "Blocked"
+            and (e.client_ip == entry.client_ip or e.department == entry.department)
+        )
     
     def _detect_burst_blocked(
         self,
         entry: ParsedLogEntry,
-        recent_entries: List[ParsedLogEntry]
-    ) -> AnomalyResult:
+        recent_blocked: int
+    ) -> Optional[AnomalyResult]:
         """
         Detect burst of blocked requests from same IP/user.
         
         Args:
             entry: Current entry
-            recent_entries: Recent entries to check
+            recent_blocked: Blocked requests in the window before this entry
             
         Returns:
-            AnomalyResult for burst detection
+            AnomalyResult for the burst, or None if there isn't one
         """
         if entry.action != "Blocked":
-            return AnomalyResult(is_anomalous=False)
-        
-        # Filter recent entries within time window
-        window_start = entry.timestamp - timedelta(minutes=self.BURST_WINDOW_MINUTES)
-        recent_blocked = [
-            e for e in recent_entries
-            if e.timestamp >= window_start
-            and e.action == "Blocked"
-            and (e.client_ip == entry.client_ip or e.department == entry.department)
-        ]
+            return None
         
         # Count current entry + recent blocked entries
-        total_blocked = len(recent_blocked) + 1
+        total_blocked = recent_blocked + 1
         
         if total_blocked >= self.BURST_THRESHOLD:
             return AnomalyResult(
@@ -148,5 +256,4 @@ class AnomalyDetector:
                 confidence=0.8
             )
         
-        return AnomalyResult(is_anomalous=False)
-
+        return None
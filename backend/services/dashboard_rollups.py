@@ -0,0 +1,146 @@
+"""Pre-rolled dashboard aggregates for processed log files."""
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy import func
+from models import LogEntry, LogEntryBucket, LogEntryTopN, LogFile
+from extensions import db
+from utils.sql_helpers import bucket_timestamp, bucket_to_datetime, percent_of_total
+
+# Width of the stored time buckets
+ROLLUP_BUCKET_MINUTES = 5
+
+# Dimension name -> LogEntry column rolled up for the top-N endpoints
+TOP_N_DIMENSIONS = {
+    'url_cat': LogEntry.url_cat,
+    'domain': LogEntry.domain,
+    'department': LogEntry.department,
+}
+
+
+def build_dashboard_rollups(log_file_id) -> None:
+    """
+    Aggregate a log file's entries into the 5-minute bucket and top-N tables.
+
+    Called once ingestion has finished; the caller commits.
+
+    Args:
+        log_file_id: ID of the log file
+    """
+    blocked = func.count().filter(LogEntry.action == 'Blocked')
+    base = LogEntry.query.filter(LogEntry.log_file_id == log_file_id)
+
+    bucket = bucket_timestamp(LogEntry.timestamp, ROLLUP_BUCKET_MINUTES).label('bucket')
+    bucket_rows = base.with_entities(bucket, func.count(), blocked).group_by(bucket).all()
+
+    top_n_rows = []
+    for dim, column in TOP_N_DIMENSIONS.items():
+        key = func.coalesce(column, '').label('key')
+        for value, count, blocked_count in base.with_entities(key, func.count(), blocked).group_by(key):
+            top_n_rows.append({
+                'log_file_id': log_file_id,
+                'dim': dim,
+                'key': value,
+                'count': count,
+                'blocked': blocked_count
+            })
+
+    db.session.query(LogEntryBucket).filter_by(log_file_id=log_file_id).delete()
+    db.session.query(LogEntryTopN).filter_by(log_file_id=log_file_id).delete()
+    db.session.bulk_insert_mappings(LogEntryBucket, [
+        {
+            'log_file_id': log_file_id,
+            'bucket_time': bucket_to_datetime(bucket_value),
+            'total': total,
+            'blocked': blocked_count
+        }
+        for bucket_value, total, blocked_count in bucket_rows
+    ])
+    db.session.bulk_insert_mappings(LogEntryTopN, top_n_rows)
+
+
+def has_rollups(log_file_id) -> bool:
+    """Check whether a log file has finished ingestion, and so has rollups."""
+    log_file = db.session.get(LogFile, log_file_id)
+    return log_file is not None and log_file.status == 'completed'
+
+
+def can_roll_up_timeline(bucket_minutes: int) -> bool:
+    """
+    Check whether a timeline bucket width can be served from the rollup.
+
+    Widths must be multiples of the stored width and divide an hour, which
+    keeps them aligned with the hour-based buckets of /timeline/v2.
+    """
+    return bucket_minutes % ROLLUP_BUCKET_MINUTES == 0 and 60 % bucket_minutes == 0
+
+
+def load_timeline(log_file_id, bucket_minutes: int, start_time: datetime,
+                  end_time: datetime) -> List[Tuple[datetime, int, int]]:
+    """
+    Roll stored buckets up to bucket_minutes between two bucket starts.
+
+    Args:
+        log_file_id: ID of the log file
+        bucket_minutes: Bucket width accepted by can_roll_up_timeline()
+        start_time: First bucket start (inclusive)
+        end_time: Last bucket start (inclusive)
+
+    Returns:
+        (bucket_time, total, blocked) for every bucket in the range,
+        including empty ones
+    """
+    step = timedelta(minutes=bucket_minutes)
+    rows = db.session.query(
+        LogEntryBucket.bucket_time,
+        LogEntryBucket.total,
+        LogEntryBucket.blocked
+    ).filter(
+        LogEntryBucket.log_file_id == log_file_id,
+        LogEntryBucket.bucket_time >= start_time,
+        LogEntryBucket.bucket_time < end_time + step
+    ).all()
+
+    counts: Dict[datetime, List[int]] = {}
+    for bucket_time, total, blocked in rows:
+        # Floor within the hour, the same way /timeline/v2 buckets raw entries
+        key = bucket_time.replace(minute=bucket_time.minute // bucket_minutes * bucket_minutes)
+        bucket = counts.setdefault(key, [0, 0])
+        bucket[0] += total
+        bucket[1] += blocked
+
+    timeline = []
+    bucket_time = start_time
+    while bucket_time <= end_time:
+        total, blocked = counts.get(bucket_time, (0, 0))
+        timeline.append((bucket_time, total, blocked))
+        bucket_time += step
+    return timeline
+
+
+def load_top_n(log_file_id, dim: str, limit: int) -> List[Tuple]:
+    """
+    Read the most frequent values of a dimension for a log file.
+
+    Args:
+        log_file_id: ID of the log file
+        dim: Key of TOP_N_DIMENSIONS
+        limit: Maximum number of values
+
+    Returns:
+        (value, count, blocked, percentage) rows by descending count; value
+        is None where the column was NULL, and percentage is relative to
+        all of the file's entries
+    """
+    rows = db.session.query(
+        LogEntryTopN.key,
+        LogEntryTopN.count,
+        LogEntryTopN.blocked,
+        percent_of_total(LogEntryTopN.count)
+    ).filter(
+        LogEntryTopN.log_file_id == log_file_id,
+        LogEntryTopN.dim == dim
+    ).order_by(LogEntryTopN.count.desc()).limit(limit).all()
+    return [
+        (key or None, count, blocked, percentage)
+        for key, count, blocked, percentage in rows
+    ]
@@ -1,18 +1,49 @@
 """Zscaler NSS web proxy log parser."""
 import csv
-import io
+import sys
 from datetime import datetime
-from urllib.parse import urlparse
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 from dataclasses import dataclass
 
 
+# Characters that end the host part of a URL
+_HOST_TERMINATORS = '/?#'
+
+
+@lru_cache(maxsize=1 << 16)
+def _extract_domain_cached(url: str) -> str:
+    """
+    Slice the domain out of a URL without building a urlparse() result.
+    
+    Memoized, since proxy logs repeat a small set of URLs heavily.
+    """
+    if url.startswith('http://'):
+        start = 7
+    elif url.startswith('https://'):
+        start = 8
+    else:
+        start = 0
+    
+    end = len(url)
+    for terminator in _HOST_TERMINATORS:
+        index = url.find(terminator, start, end)
+        if index != -1:
+            end = index
+    
+    # Remove port if present
+    port = url.find(':', start, end)
+    if port != -1:
+        end = port
+    return url[start:end]
+
+
 class LogParseError(Exception):
     """Error parsing log line."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedLogEntry:
     """Parsed log entry data."""
     timestamp: datetime
@@ -55,6 +86,15 @@ class ZscalerLogParser:
     # Expected number of fields in Zscaler log format
     EXPECTED_FIELD_COUNT = 34
     
+    # Month abbreviations in Zscaler timestamps
+    _MONTHS = {
+        'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+        'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+    }
+    
+    # Most recently parsed (timestamp string, datetime)
+    _last_timestamp = (None, None)
+    
     def parse_line(self, line: str) -> ParsedLogEntry:
         """
         Parse a single Zscaler log line.
@@ -70,16 +110,77 @@ class ZscalerLogParser:
         """
         try:
             # Use CSV reader to handle quoted fields and commas correctly
-            reader = csv.reader(io.StringIO(line))
-            fields = next(reader)
+            fields = next(csv.reader((line,)))
+        except (csv.Error, StopIteration) as e:
+            raise LogParseError(f"Error parsing log line: {str(e)}") from e
+        return self._parse_fields(fields)
+    
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[ParsedLogEntry]:
+        """
+        Parse a stream of Zscaler log lines, skipping lines that can't be parsed.
+        
+        All lines go through one CSV reader instead of a reader per line.
+        A line with an unbalanced quote makes the reader run on into the
+        lines after it; when a record spans more than one line, each of those
+        lines is parsed on its own instead, exactly as parse_line would (as
+        is a line the reader rejects).
+        
+        Args:
+            lines: CSV lines with 34 quoted fields
             
+        Yields:
+            ParsedLogEntry for each valid line
+        """
+        # Lines the reader consumed for the current record
+        consumed = []
+        
+        def feed():
+            for line in lines:
+                consumed.append(line)
+                yield line
+        
+        reader = csv.reader(feed())
+        while True:
+            consumed.clear()
+            try:
+                fields = next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                fields = None
+            if fields is not None and len(consumed) == 1:
+                try:
+                    yield self._parse_fields(fields)
+                except LogParseError:
+                    continue
+            else:
+                for line in consumed:
+                    try:
+                        yield self.parse_line(line)
+                    except LogParseError:
+                        continue
+    
+    def _parse_fields(self, fields: list) -> ParsedLogEntry:
+        """
+        Build a ParsedLogEntry from the fields of one log line.
+        
+        Raises:
+            LogParseError: If the fields don't form a valid entry
+        """
+        try:
             if len(fields) != self.EXPECTED_FIELD_COUNT:
                 raise LogParseError(
                     f"Expected {self.EXPECTED_FIELD_COUNT} fields, got {len(fields)}"
                 )
             
-            # Parse timestamp (field 0)
-            timestamp = self._parse_timestamp(fields[0])
+            # Parse timestamp (field 0). Consecutive lines mostly share a
+            # second, so reuse the previous line's result when it matches
+            timestamp_str = fields[0]
+            last_timestamp_str, timestamp = self._last_timestamp
+            if timestamp_str != last_timestamp_str:
+                timestamp = self._parse_timestamp(timestamp_str)
+                # One tuple, so threads sharing the parser never see a mismatched pair
+                self._last_timestamp = (timestamp_str, timestamp)
             
             # Extract domain from URL (field 3)
             url = fields[3]
@@ -108,7 +209,7 @@ class ZscalerLogParser:
                 resp_size=resp_size,
                 url_class=fields[11],
                 url_supercat=fields[12],
-                url_cat=fields[13],
+                url_cat=sys.intern(fields[13]),  # Few distinct values; share one copy of each
                 dlp_dict=fields[14],
                 dlp_eng=fields[15],
                 dlp_hits=dlp_hits,
@@ -143,8 +244,22 @@ class ZscalerLogParser:
         Raises:
             LogParseError: If timestamp cannot be parsed
         """
+        # Zscaler format: "Mon Jun 20 12:00:00 2022"
+        # The format is fixed-width, so read fields at fixed offsets rather
+        # than going through strptime; anything unexpected falls back to it
+        if len(timestamp_str) == 24 and timestamp_str[13] == ':' and timestamp_str[16] == ':':
+            try:
+                return datetime(
+                    int(timestamp_str[20:24]),
+                    self._MONTHS[timestamp_str[4:7]],
+                    int(timestamp_str[8:10]),
+                    int(timestamp_str[11:13]),
+                    int(timestamp_str[14:16]),
+                    int(timestamp_str[17:19])
+                )
+            except (KeyError, ValueError):
+                pass
         try:
-            # Zscaler format: "Mon Jun 20 12:00:00 2022"
             return datetime.strptime(timestamp_str, "%a %b %d %H:%M:%S %Y")
         except ValueError as e:
             raise LogParseError(f"Invalid timestamp format: {timestamp_str}") from e
@@ -159,28 +274,7 @@ class ZscalerLogParser:
         Returns:
             Domain name
         """
-        if not url:
-            return ""
-        
-        # Add protocol if missing for urlparse
-        if not url.startswith(('http://', 'https://')):
-            url = f"http://{url}"
-        
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path.split('/')[0]
-            # Remove port if present
-            domain = domain.split(':')[0]
-            return domain
-        except Exception:
-            # Fallback: try to extract domain manually
-            # Remove protocol
-            url = url.replace('http://', '').replace('https://', '')
-            # Get first part before /
-            domain = url.split('/')[0]
-            # Remove port
-            domain = domain.split(':')[0]
-            return domain
+        return _extract_domain_cached(url)
     
     def _parse_int(self, value: str, default: int = 0) -> int:
         """
@@ -193,6 +287,10 @@ class ZscalerLogParser:
         Returns:
             Integer value
         """
+        # Plain digit strings are nearly every value; isdecimal() accepts
+        # exactly the digits int() does, so convert them without the checks
+        if value.isdecimal():
+            return int(value)
         if not value or value.strip() == "":
             return default
         try:
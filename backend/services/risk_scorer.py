@@ -1,7 +1,11 @@
 """User risk score calculation service."""
-from typing import Dict, List
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
 from models import LogEntry
 
+# (user_identifier, is_anomalous, anomaly_type, action) for one log entry
+RiskRecord = Tuple[str, bool, Optional[str], str]
+
 
 def calculate_user_risk_scores(log_file_id: str, entries: List[LogEntry]) -> Dict[str, Dict]:
     """
@@ -15,57 +19,89 @@ def calculate_user_risk_scores(log_file_id: str, entries: List[LogEntry]) -> Dic
         Dictionary mapping user_identifier to risk score data
     """
     user_stats = {}
+    accumulate_user_stats(user_stats, (
+        (risk_user_identifier(entry.department, entry.client_ip),
+         entry.is_anomalous, entry.anomaly_type, entry.action)
+        for entry in entries
+    ))
+    return score_user_stats(user_stats)
+
+
+def risk_user_identifier(department: Optional[str], client_ip) -> str:
+    """Identify the user an entry is scored against: its department, else its client IP."""
+    return department or str(client_ip)
+
+
+def accumulate_user_stats(user_stats: Dict[str, Dict], records: Iterable[RiskRecord]) -> None:
+    """
+    Add log entries to per-user risk counters.
     
-    for entry in entries:
-        # Use department or client_ip as user identifier
-        user_id = entry.department or str(entry.client_ip)
-        
-        if user_id not in user_stats:
-            user_stats[user_id] = {
+    Lets callers score a log file as it is ingested instead of reading its
+    entries back afterwards.
+    
+    Args:
+        user_stats: Counters by user_identifier, updated in place
+        records: One RiskRecord per log entry
+    """
+    # Records repeat heavily (a few outcomes per user), so group identical
+    # ones with Counter's C loop and update the counters once per group
+    for (user_id, is_anomalous, anomaly_type, action), count in Counter(records).items():
+        stats = user_stats.get(user_id)
+        if stats is None:
+            stats = user_stats[user_id] = {
                 'anomaly_count': 0,
                 'blocked_count': 0,
                 'malicious_domain_count': 0,
                 'total_requests': 0,
-                'by_anomaly_type': {}
+                'by_anomaly_type': defaultdict(int)
             }
         
-        stats = user_stats[user_id]
-        stats['total_requests'] += 1
+        stats['total_requests'] += count
         
-        if entry.is_anomalous:
-            stats['anomaly_count'] += 1
-            anomaly_type = entry.anomaly_type or 'unknown'
-            stats['by_anomaly_type'][anomaly_type] = stats['by_anomaly_type'].get(anomaly_type, 0) + 1
+        if is_anomalous:
+            stats['anomaly_count'] += count
+            stats['by_anomaly_type'][anomaly_type or 'unknown'] += count
         
-        if entry.action == 'Blocked':
-            stats['blocked_count'] += 1
+        if action == 'Blocked':
+            stats['blocked_count'] += count
         
-        if entry.anomaly_type == 'malicious_domain':
-            stats['malicious_domain_count'] += 1
+        if anomaly_type == 'malicious_domain':
+            stats['malicious_domain_count'] += count
+
+
+def score_user_stats(user_stats: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Turn per-user counters into risk scores (0-100).
     
-    # Calculate risk scores (0-100)
-    risk_scores = {}
-    for user_id, stats in user_stats.items():
-        # Base score from anomalies
-        anomaly_score = min(stats['anomaly_count'] * 10, 50)
-        
-        # Blocked requests score
-        blocked_score = min(stats['blocked_count'] * 5, 30)
-        
-        # Malicious domain score
-        malicious_score = min(stats['malicious_domain_count'] * 20, 40)
-        
-        # Total risk score (capped at 100)
-        risk_score = min(anomaly_score + blocked_score + malicious_score, 100)
+    Args:
+        user_stats: Counters built by accumulate_user_stats()
         
-        risk_scores[user_id] = {
+    Returns:
+        Dictionary mapping user_identifier to risk score data
+    """
+    return {
+        user_id: {
             'user_identifier': user_id,
-            'risk_score': risk_score,
+            'risk_score': _risk_score(stats),
             'anomaly_count': stats['anomaly_count'],
             'blocked_count': stats['blocked_count'],
             'malicious_domain_count': stats['malicious_domain_count'],
-            'metadata': stats['by_anomaly_type']
+            'metadata': dict(stats['by_anomaly_type'])
         }
-    
-    return risk_scores
+        for user_id, stats in user_stats.items()
+    }
+
 
+def _risk_score(stats: Dict) -> int:
+    """Combine one user's counters into a risk score (0-100)."""
+    # Base score from anomalies
+    anomaly_score = min(stats['anomaly_count'] * 10, 50)
+    
+    # Blocked requests score
+    blocked_score = min(stats['blocked_count'] * 5, 30)
+    
+    # Malicious domain score
+    malicious_score = min(stats['malicious_domain_count'] * 20, 40)
+    
+    # Total risk score (capped at 100)
+    return min(anomaly_score + blocked_score + malicious_score, 100)
@@ -0,0 +1,83 @@
+"""Precomputed anomaly timeline for processed log files."""
+from typing import Dict, List
+from sqlalchemy import func
+from models import LogEntry, LogFileTimelineSummary
+from extensions import db
+from utils.sql_helpers import EPOCH, bucket_timestamp, bucket_to_datetime
+
+# Width of the stored buckets. Requests for any multiple of this are rolled
+# up from the summary; other widths are aggregated from log_entries.
+SUMMARY_BUCKET_MINUTES = 5
+
+
+def build_timeline_summary(log_file_id) -> None:
+    """
+    Aggregate a log file's anomalies into LogFileTimelineSummary rows.
+
+    Called once ingestion has finished; the caller commits.
+
+    Args:
+        log_file_id: ID of the log file
+    """
+    bucket = bucket_timestamp(LogEntry.timestamp, SUMMARY_BUCKET_MINUTES).label('bucket')
+    anomaly_type = func.coalesce(LogEntry.anomaly_type, 'unknown').label('anomaly_type')
+    rows = db.session.query(
+        bucket,
+        anomaly_type,
+        func.count().label('count')
+    ).filter(
+        LogEntry.log_file_id == log_file_id,
+        LogEntry.is_anomalous == True
+    ).group_by(bucket, anomaly_type).all()
+
+    db.session.query(LogFileTimelineSummary).filter_by(log_file_id=log_file_id).delete()
+    db.session.bulk_insert_mappings(LogFileTimelineSummary, [
+        {
+            'log_file_id': log_file_id,
+            'bucket_ts': bucket_to_datetime(bucket_value),
+            'anomaly_type': row_type,
+            'count': count
+        }
+        for bucket_value, row_type, count in rows
+    ])
+
+
+def can_use_timeline_summary(bucket_minutes: int) -> bool:
+    """Check whether a bucket width can be rolled up from the summary."""
+    return bucket_minutes % SUMMARY_BUCKET_MINUTES == 0
+
+
+def load_timeline_summary(log_file_id, bucket_minutes: int) -> List[Dict]:
+    """
+    Read a log file's anomaly timeline from the summary table.
+
+    Args:
+        log_file_id: ID of the log file
+        bucket_minutes: Bucket width; must be a multiple of SUMMARY_BUCKET_MINUTES
+
+    Returns:
+        List of {'time', 'count', 'by_type'} buckets in time order
+    """
+    bucket_seconds = bucket_minutes * 60
+    rows = db.session.query(
+        LogFileTimelineSummary.bucket_ts,
+        LogFileTimelineSummary.anomaly_type,
+        LogFileTimelineSummary.count
+    ).filter(
+        LogFileTimelineSummary.log_file_id == log_file_id
+    ).order_by(LogFileTimelineSummary.bucket_ts).all()
+
+    buckets = {}
+    for bucket_ts, anomaly_type, count in rows:
+        bucket_id = int((bucket_ts - EPOCH).total_seconds()) // bucket_seconds
+        bucket = buckets.get(bucket_id)
+        if bucket is None:
+            bucket = buckets[bucket_id] = {
+                'time': bucket_to_datetime(bucket_id * bucket_seconds),
+                'count': 0,
+                'by_type': {}
+            }
+        bucket['count'] += count
+        bucket['by_type'][anomaly_type] = bucket['by_type'].get(anomaly_type, 0) + count
+
+    return list(buckets.values())
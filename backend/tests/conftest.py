@@ -5,10 +5,11 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 import os
+import shutil
 import sys
-import tempfile
 import uuid
 import requests
+from sqlalchemy import event, insert
 
 # Add backend directory to Python path for imports
 backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,30 +17,97 @@ if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
 from app import create_app
-from extensions import db
+from config import TestingConfig
+from extensions import cache, db
+from routes import ai, dashboard, logs
+from utils import revocation_cache
 
 
-@pytest.fixture
-def app():
-    """Create application for testing."""
-    # Use in-memory SQLite for tests
-    db_fd, db_path = tempfile.mkstemp()
-    
-    app = create_app(test_config={
+def _test_config(db_path):
+    """Build the app config used by the test fixtures."""
+    return {
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
         'SQLALCHEMY_TRACK_MODIFICATIONS': False,
         'JWT_SECRET_KEY': 'test-secret-key',
-        'OPENAI_API_KEY': 'test-openai-key'
-    })
+        'OPENAI_API_KEY': 'test-openai-key',
+        'PASSWORD_HASHER': TestingConfig.PASSWORD_HASHER
+    }
+
+
+@pytest.fixture(scope='session')
+def test_db_dir(tmp_path_factory):
+    """Directory holding the test database and its template copy."""
+    return tmp_path_factory.mktemp('db')
+
+
+@pytest.fixture(scope='session')
+def session_app(test_db_dir):
+    """Create the application shared by every test.
     
+    Building the app (mostly compiling its URL rules) is the bulk of a
+    test's setup, so it happens once; the app fixture resets its database,
+    config and cache for each test. The schema is created once too, and
+    saved as a template that each test's database is copied from.
+    """
+    app = create_app(test_config=_test_config(test_db_dir / 'test.db'))
     with app.app_context():
+        event.listen(db.engine, 'connect', _skip_sqlite_fsync)
         db.create_all()
-        yield app
-        db.drop_all()
+        db.engine.dispose()
+    shutil.copyfile(test_db_dir / 'test.db', test_db_dir / 'schema.db')
+    return app
+
+
+@pytest.fixture
+def app(session_app, test_db_dir):
+    """Create application for testing."""
+    config = session_app.config.copy()
+    json_compact = session_app.json.compact
+    
+    with session_app.app_context():
+        # Each test gets a fresh copy of the template database, which is much
+        # cheaper than creating and dropping every table; disposing the
+        # engine first makes every new connection open the copy
+        db.engine.dispose()
+        shutil.copyfile(test_db_dir / 'schema.db', test_db_dir / 'test.db')
+        cache.clear()
+        revocation_cache._local.clear()
+        yield session_app
+        _shutdown_executors()
+        db.session.remove()
+    
+    session_app.config.clear()
+    session_app.config.update(config)
+    session_app.json.compact = json_compact
+
+
+def _shutdown_executors():
+    """
+    Wait for background work a test started and drop the shared executors.
     
-    os.close(db_fd)
-    os.unlink(db_path)
+    Queued uploads and AI jobs run against the shared app, so they must
+    finish before the next test's database is copied into place; the next
+    test then builds executors from its own config.
+    """
+    for module, name in (
+        (logs, '_ingest_executor'),
+        (ai, '_job_executor'),
+        (dashboard, '_summary_executor'),
+    ):
+        executor = getattr(module, name)
+        if executor is not None:
+            executor.shutdown(wait=True)
+            setattr(module, name, None)
+    logs._ingest_slots = None
+
+
+def _skip_sqlite_fsync(dbapi_connection, connection_record):
+    """Keep commits in memory; a test database needn't survive a crash."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA synchronous=OFF')
+    cursor.execute('PRAGMA journal_mode=MEMORY')
+    cursor.close()
 
 
 @pytest.fixture
@@ -66,6 +134,43 @@ def authenticated_client(app, sample_user_data):
     return client
 
 
+@pytest.fixture
+def auth_headers(app, sample_user_data):
+    """Create a test user and return a Bearer Authorization header for it."""
+    from models import User
+    from flask_jwt_extended import create_access_token
+    
+    with app.app_context():
+        user = User(email=sample_user_data['email'], password=sample_user_data['password'])
+        db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity=str(user.id))
+    
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def log_file_with_entries(app, auth_headers, sample_user_data):
+    """Factory creating a log file uploaded by the test user.
+    
+    Takes the file's status, its entries as dicts of LogEntry columns
+    (log_file_id is filled in) and any other LogFile fields, and returns the
+    file's ID.
+    """
+    from models import LogEntry, LogFile, User
+    
+    def _create(status='completed', rows=(), filename='test.log', **fields):
+        user = User.query.filter_by(email=sample_user_data['email']).first()
+        log_file = LogFile(filename=filename, uploaded_by=user.id, status=status, **fields)
+        db.session.add(log_file)
+        db.session.commit()
+        if rows:
+            db.session.execute(insert(LogEntry), [dict(row, log_file_id=log_file.id) for row in rows])
+            db.session.commit()
+        return log_file.id
+    return _create
+
+
 @pytest.fixture
 def sample_user_data():
     """Sample user data for testing."""
@@ -147,9 +252,32 @@ def api_session(api_base_url):
     return session
 
 
-@pytest.fixture(scope='function')
-def authenticated_session(api_session, api_base_url):
-    """Create an authenticated session with JWT token."""
+@pytest.fixture(scope='session')
+def authenticated_session(api_base_url):
+    """Create an authenticated session with JWT token.
+    
+    Logs in once and reuses the token for every test in the run. Tests that
+    revoke it (e.g. by logging out) must use revoking_session instead.
+    """
+    session = requests.Session()
+    session.base_url = api_base_url
+    _authenticate(session, api_base_url)
+    return session
+
+
+@pytest.fixture
+def revoking_session(authenticated_session, api_base_url):
+    """Authenticated session for a test that revokes the user's tokens.
+    
+    Logs the shared session back in afterwards, so later tests still get a
+    valid token.
+    """
+    yield authenticated_session
+    _authenticate(authenticated_session, api_base_url)
+
+
+def _authenticate(session, api_base_url):
+    """Log a session in with the test credentials, skipping the test on failure."""
     # Try to login with default test credentials
     # These should be created in the test database
     login_data = {
@@ -158,19 +286,17 @@ def authenticated_session(api_session, api_base_url):
     }
     
     try:
-        response = api_session.post(
+        response = session.post(
             f'{api_base_url}/api/auth/login',
             json=login_data,
             timeout=5
         )
         if response.status_code == 200:
             token = response.json()['token']
-            api_session.headers.update({'Authorization': f'Bearer {token}'})
-            return api_session
+            session.headers.update({'Authorization': f'Bearer {token}'})
         else:
             pytest.skip(f"Cannot authenticate: {response.status_code} - {response.text}")
     except requests.exceptions.ConnectionError:
         pytest.skip(f"Cannot connect to backend at {api_base_url}. Is the backend running?")
     except requests.exceptions.RequestException as e:
         pytest.skip(f"Request failed: {str(e)}")
-
@@ -0,0 +1,57 @@
+"""Tests for AI service."""
+import pytest
+from datetime import datetime
+from services.ai_service import AIService, SUPPORTING_ENTRY_LIMIT
+
+
+@pytest.fixture
+def investigated_log_file(log_file_with_entries):
+    """Create a log file with blocked, malicious and normal entries."""
+    entries = (
+        [('Blocked', 'malicious_domain')] * 2
+        + [('Blocked', None)] * 6
+        + [('Allowed', None)] * 3
+    )
+    return log_file_with_entries(
+        'completed',
+        [
+            dict(
+                timestamp=datetime(2022, 6, 20, 10, i, 0),
+                url=f'https://example.com/{i}',
+                domain='example.com',
+                action=action,
+                is_anomalous=anomaly_type is not None,
+                anomaly_type=anomaly_type
+            )
+            for i, (action, anomaly_type) in enumerate(entries)
+        ],
+        filename='investigate.log'
+    )
+
+
+class TestAIService:
+    """Tests for AIService."""
+    
+    def test_should_count_entries_when_generating_summary(self, investigated_log_file):
+        # Act
+        result = AIService().generate_log_summary(investigated_log_file)
+        
+        # Assert
+        assert 'Total requests analyzed: 11' in result['summary']
+        assert 'Blocked events: 8' in result['summary']
+        assert 'Malicious URLs detected: 2' in result['summary']
+    
+    @pytest.mark.parametrize('question, expected_answer, expected_supporting', [
+        ('Any phishing?', 'Found 2 malicious/phishing entries', 2),
+        ('What was blocked?', 'Found 8 blocked requests', SUPPORTING_ENTRY_LIMIT),
+        ('What happened?', 'Based on the log data', SUPPORTING_ENTRY_LIMIT),
+    ])
+    def test_should_count_all_and_return_few_entries_when_investigating(
+        self, investigated_log_file, question, expected_answer, expected_supporting
+    ):
+        # Act
+        result = AIService().investigate(investigated_log_file, question)
+        
+        # Assert
+        assert result['answer'].startswith(expected_answer)
+        assert len(result['supporting_entries']) == expected_supporting
@@ -0,0 +1,31 @@
+"""Tests for the application factory."""
+from app import create_app, _warm_statement_cache
+
+
+class TestStatementCacheWarmUp:
+    """Tests for compiled statement cache warm-up at startup."""
+
+    def test_should_run_warm_up_queries_when_tables_exist(self, app, mocker):
+        # Arrange
+        warning = mocker.spy(app.logger, 'warning')
+
+        # Act
+        _warm_statement_cache(app)
+
+        # Assert
+        warning.assert_not_called()
+
+    def test_should_start_app_when_warm_up_queries_fail(self):
+        # Arrange
+        config = {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+            'JWT_SECRET_KEY': 'test-secret-key',
+            'SQLALCHEMY_WARM_STATEMENT_CACHE': True
+        }
+
+        # Act - no tables exist, so every warm-up query errors
+        app = create_app(test_config=config)
+
+        # Assert
+        assert app is not None
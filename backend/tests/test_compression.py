@@ -0,0 +1,42 @@
+"""Tests for response compression."""
+import pytest
+from flask import jsonify
+from app import create_app
+
+
+@pytest.fixture
+def compress_client():
+    """Create a test client for an app with a large and a small JSON route."""
+    app = create_app(test_config={
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'JWT_SECRET_KEY': 'test-secret-key'
+    })
+    app.add_url_rule('/large', 'large', lambda: jsonify({'items': ['Allowed'] * 500}))
+    app.add_url_rule('/small', 'small', lambda: jsonify({'ok': True}))
+    return app.test_client()
+
+
+class TestCompression:
+    """Tests for Flask-Compress configuration."""
+
+    def test_should_use_brotli_when_client_accepts_it(self, compress_client):
+        # Act
+        response = compress_client.get('/large', headers={'Accept-Encoding': 'gzip, br'})
+
+        # Assert
+        assert response.headers.get('Content-Encoding') == 'br'
+
+    def test_should_use_gzip_when_brotli_not_accepted(self, compress_client):
+        # Act
+        response = compress_client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+        # Assert
+        assert response.headers.get('Content-Encoding') == 'gzip'
+
+    def test_should_not_compress_when_response_below_min_size(self, compress_client):
+        # Act
+        response = compress_client.get('/small', headers={'Accept-Encoding': 'gzip, br'})
+
+        # Assert
+        assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,54 @@
+"""Tests for CORS configuration."""
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def cors_client():
+    """Create a test client for an app with an allowed CORS origin."""
+    app = create_app(test_config={
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'JWT_SECRET_KEY': 'test-secret-key',
+        'CORS_ORIGINS': ['http://localhost:3000'],
+        'CORS_MAX_AGE': 600
+    })
+    return app.test_client()
+
+
+class TestCorsPreflight:
+    """Tests for CORS preflight responses."""
+
+    def test_should_emit_max_age_when_preflight_request(self, cors_client):
+        # Act
+        response = cors_client.options('/api/anomalies', headers={
+            'Origin': 'http://localhost:3000',
+            'Access-Control-Request-Method': 'GET',
+            'Access-Control-Request-Headers': 'Authorization'
+        })
+
+        # Assert
+        assert response.headers.get('Access-Control-Allow-Origin') == 'http://localhost:3000'
+        assert response.headers.get('Access-Control-Max-Age') == '600'
+
+    def test_should_answer_preflight_without_auth_when_route_exists(self, cors_client):
+        # Act
+        response = cors_client.options('/api/dashboard/stats', headers={
+            'Origin': 'http://localhost:3000',
+            'Access-Control-Request-Method': 'GET'
+        })
+
+        # Assert
+        assert response.status_code == 204
+        assert 'GET' in response.headers.get('Allow', '')
+        assert response.headers.get('Access-Control-Allow-Origin') == 'http://localhost:3000'
+
+    def test_should_return_404_when_preflight_route_missing(self, cors_client):
+        # Act
+        response = cors_client.options('/api/does-not-exist', headers={
+            'Origin': 'http://localhost:3000',
+            'Access-Control-Request-Method': 'GET'
+        })
+
+        # Assert
+        assert response.status_code == 404
@@ -1,29 +1,35 @@
 """Tests for error handlers."""
 import pytest
 from sqlalchemy.exc import OperationalError, IntegrityError, DatabaseError
-from flask import jsonify
-from app import create_app
-from extensions import db
+from flask import Flask
+from app import register_error_handlers
 
 
-class TestDatabaseErrorHandling:
-    """Tests for database error handling."""
+@pytest.fixture
+def err_app():
+    """Bare app with only the error handlers and a route that fails."""
+    app = Flask('unit')
+    register_error_handlers(app)
     
-    def test_should_return_json_error_when_database_connection_fails(self, client, mocker):
-        # Arrange
-        # Mock a database query to raise OperationalError
-        mocker.patch('extensions.db.session.execute', side_effect=OperationalError(
+    @app.get('/boom')
+    def boom():
+        raise OperationalError(
             statement="SELECT 1",
             params=None,
             orig=Exception("Connection refused")
-        ))
-        
+        )
+    
+    return app
+
+
+class TestDatabaseErrorHandling:
+    """Tests for database error handling."""
+    
+    def test_should_return_json_error_when_database_connection_fails(self, err_app):
         # Act
-        # Try to access a route that queries the database
-        response = client.get('/api/health')
+        response = err_app.test_client().get('/boom')
         
-        # Assert - The error handler should catch this and return JSON
-        # Note: This test may need adjustment based on actual route behavior
+        # Assert
         assert response.status_code in [500, 503]
         data = response.get_json()
         assert data is not None
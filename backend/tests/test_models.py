@@ -1,9 +1,11 @@
 """Tests for database models."""
 import pytest
+import uuid
 from datetime import datetime
-from werkzeug.security import check_password_hash
+from sqlalchemy.dialects import postgresql, sqlite
+from werkzeug.security import generate_password_hash
 
-from models import User, LogFile, LogEntry, UserRiskScore
+from models import User, LogFile, LogEntry, UserRiskScore, UUIDType
 from extensions import db
 
 
@@ -26,7 +28,7 @@ class TestUser:
             assert user.email == sample_user_data['email']
             assert user.password_hash is not None
             assert user.password_hash != sample_user_data['password']  # Should be hashed
-            assert check_password_hash(user.password_hash, sample_user_data['password'])
+            assert user.password_hash.startswith('$argon2')
             assert user.created_at is not None
             assert user.updated_at is not None
     
@@ -56,6 +58,17 @@ class TestUser:
             # Assert
             assert result is True
     
+    def test_should_verify_password_when_hash_is_legacy_werkzeug(self, app, sample_user_data):
+        # Arrange
+        with app.app_context():
+            user = User(email=sample_user_data['email'], password='placeholder')
+            # Single-iteration pbkdf2 keeps the legacy hash cheap to build and check
+            user.password_hash = generate_password_hash(sample_user_data['password'], method='pbkdf2:sha256:1')
+            
+            # Act & Assert
+            assert user.check_password(sample_user_data['password'])
+            assert not user.check_password('wrongpassword')
+    
     def test_should_reject_password_when_incorrect(self, app, sample_user_data):
         # Arrange
         with app.app_context():
@@ -233,6 +246,34 @@ class TestLogEntry:
             assert log_entry.anomaly_type == 'malicious_domain'
             assert log_entry.anomaly_reason == 'Domain in malicious list'
             assert log_entry.anomaly_confidence == 0.95
+    
+    def test_should_serialize_all_fields_when_to_dict_called(self, app, sample_user_data, sample_log_file_data, sample_log_entry_data):
+        # Arrange
+        with app.app_context():
+            user = User(email=sample_user_data['email'], password=sample_user_data['password'])
+            db.session.add(user)
+            db.session.commit()
+            
+            log_file = LogFile(filename=sample_log_file_data['filename'], uploaded_by=user.id)
+            db.session.add(log_file)
+            db.session.commit()
+            
+            log_entry = LogEntry(log_file_id=log_file.id, **sample_log_entry_data)
+            db.session.add(log_entry)
+            db.session.commit()
+            
+            # Act
+            data = log_entry.to_dict()
+            
+            # Assert
+            assert len(data) == 39
+            assert data['id'] == str(log_entry.id)
+            assert data['log_file_id'] == str(log_file.id)
+            assert data['timestamp'] == '2022-06-20T12:00:00'
+            assert data['url'] == 'https://example.com/path'
+            assert data['client_ip'] == '172.17.3.49'
+            assert data['created_at'] == log_entry.created_at.isoformat()
+            assert list(data)[:3] == ['id', 'log_file_id', 'timestamp']
 
 
 class TestUserRiskScore:
@@ -276,3 +317,26 @@ class TestUserRiskScore:
             assert risk_score.malicious_domain_count == 2
             assert risk_score.calculated_at is not None
 
+
+class TestUUIDType:
+    """Tests for UUIDType bind processing."""
+    
+    def test_should_pass_uuid_through_when_dialect_is_postgresql(self):
+        # Arrange
+        value = uuid.uuid4()
+        
+        # Act
+        bound = UUIDType().process_bind_param(value, postgresql.dialect())
+        
+        # Assert
+        assert bound is value
+    
+    def test_should_stringify_uuid_when_dialect_is_sqlite(self):
+        # Arrange
+        value = uuid.uuid4()
+        
+        # Act
+        bound = UUIDType().process_bind_param(value, sqlite.dialect())
+        
+        # Assert
+        assert bound == str(value)
@@ -0,0 +1,62 @@
+"""Tests for user risk scoring."""
+from types import SimpleNamespace
+from services.risk_scorer import accumulate_user_stats, calculate_user_risk_scores, score_user_stats
+
+
+class TestRiskScorer:
+    """Tests for risk score calculation."""
+    
+    def test_should_score_users_when_records_accumulated_in_batches(self):
+        # Arrange
+        user_stats = {}
+        
+        # Act
+        accumulate_user_stats(user_stats, [
+            ('Engineering', True, 'malicious_domain', 'Blocked'),
+            ('Engineering', False, None, 'Allowed'),
+        ])
+        accumulate_user_stats(user_stats, [
+            ('Engineering', True, 'unusual_ua', 'Allowed'),
+            ('10.0.0.1', False, None, 'Blocked'),
+        ])
+        scores = score_user_stats(user_stats)
+        
+        # Assert
+        assert scores['Engineering']['risk_score'] == 10 * 2 + 5 + 20
+        assert scores['Engineering']['metadata'] == {'malicious_domain': 1, 'unusual_ua': 1}
+        assert scores['10.0.0.1']['risk_score'] == 5
+    
+    def test_should_match_accumulated_scores_when_scoring_entries(self):
+        # Arrange
+        entries = [
+            SimpleNamespace(department=None, client_ip='10.0.0.1', is_anomalous=True,
+                            anomaly_type='burst_blocked', action='Blocked'),
+            SimpleNamespace(department='Sales', client_ip='10.0.0.2', is_anomalous=False,
+                            anomaly_type=None, action='Allowed'),
+        ]
+        user_stats = {}
+        accumulate_user_stats(user_stats, [
+            ('10.0.0.1', True, 'burst_blocked', 'Blocked'),
+            ('Sales', False, None, 'Allowed'),
+        ])
+        
+        # Act
+        scores = calculate_user_risk_scores('log-file', entries)
+        
+        # Assert
+        assert scores == score_user_stats(user_stats)
+    
+    def test_should_count_each_record_when_records_repeat(self):
+        # Arrange
+        user_stats = {}
+        records = [('Sales', True, 'unusual_ua', 'Blocked')] * 3 + [('Sales', False, None, 'Allowed')] * 2
+        
+        # Act
+        accumulate_user_stats(user_stats, records)
+        
+        # Assert
+        stats = user_stats['Sales']
+        assert stats['total_requests'] == 5
+        assert stats['anomaly_count'] == 3
+        assert stats['blocked_count'] == 3
+        assert stats['by_anomaly_type'] == {'unusual_ua': 3}
@@ -0,0 +1,174 @@
+"""Tests for AI routes."""
+import time
+from flask_jwt_extended import create_access_token
+from models import User
+from extensions import cache, db
+from routes import ai
+
+
+class TestLogSummary:
+    """Tests for /api/ai/log-summary/<log_file_id> endpoint."""
+
+    def test_should_reuse_cached_summary_when_file_completed(
+        self, client, auth_headers, log_file_with_entries, mocker
+    ):
+        # Arrange
+        file_id = str(log_file_with_entries('completed'))
+        generate = mocker.patch(
+            'routes.ai.AIService.generate_log_summary',
+            return_value={'summary': 'cached'}
+        )
+
+        # Act
+        first = client.get(f'/api/ai/log-summary/{file_id}', headers=auth_headers)
+        second = client.get(f'/api/ai/log-summary/{file_id}', headers=auth_headers)
+
+        # Assert
+        assert first.get_json() == {'summary': 'cached'}
+        assert second.get_json() == {'summary': 'cached'}
+        assert generate.call_count == 1
+
+    def test_should_serve_stale_summary_and_refresh_when_file_processing(
+        self, app, client, auth_headers, log_file_with_entries, mocker
+    ):
+        # Arrange
+        file_id = str(log_file_with_entries('processing'))
+        mocker.patch('routes.ai.AIService.generate_log_summary')
+        schedule = mocker.patch('routes.ai._schedule_summary_refresh')
+        with app.app_context():
+            cache.set(f'ai:log_summary_live:{file_id}', {
+                'summary': {'summary': 'stale'},
+                'cached_at': time.time() - 3600
+            })
+
+        # Act
+        response = client.get(f'/api/ai/log-summary/{file_id}', headers=auth_headers)
+
+        # Assert
+        assert response.get_json() == {'summary': 'stale'}
+        schedule.assert_called_once()
+
+    def test_should_return_404_when_log_file_missing(self, client, auth_headers):
+        # Act
+        response = client.get(
+            '/api/ai/log-summary/00000000-0000-0000-0000-000000000000',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 404
+
+
+class TestAIServiceLoading:
+    """Tests for lazy AIService construction."""
+
+    def test_should_construct_service_once_when_first_requested(self, mocker):
+        # Arrange
+        mocker.patch.object(ai, '_ai_service', None)
+        service_cls = mocker.patch.object(ai, 'AIService')
+
+        # Act
+        first = ai._get_ai_service()
+        second = ai._get_ai_service()
+
+        # Assert
+        assert first is second
+        service_cls.assert_called_once_with()
+
+
+class TestInvestigate:
+    """Tests for /api/ai/investigate endpoints."""
+
+    def test_should_queue_investigation_when_async_requested(
+        self, client, auth_headers, log_file_with_entries, mocker
+    ):
+        # Arrange - run queued jobs inline
+        file_id = str(log_file_with_entries('completed'))
+        mocker.patch('routes.ai.AIService.investigate', return_value={'answer': 'done'})
+        mocker.patch('routes.ai._job_state_is_shared', return_value=True)
+        mocker.patch('routes.ai._get_job_executor', return_value=mocker.Mock(
+            submit=lambda fn, *args: fn(*args)
+        ))
+
+        # Act
+        queued = client.post('/api/ai/investigate', headers=auth_headers, json={
+            'log_file_id': file_id,
+            'question': 'Any blocked requests?',
+            'async': True
+        })
+        job = client.get(queued.get_json()['status_url'], headers=auth_headers)
+
+        # Assert
+        assert queued.status_code == 202
+        assert job.status_code == 200
+        assert job.get_json()['status'] == 'completed'
+        assert job.get_json()['result'] == {'answer': 'done'}
+        assert 'user_id' not in job.get_json()
+
+    def test_should_return_501_when_async_requested_without_shared_cache(
+        self, client, auth_headers, log_file_with_entries, mocker
+    ):
+        # Arrange - the test app's SimpleCache is per process
+        file_id = str(log_file_with_entries('completed'))
+        submit = mocker.patch('routes.ai._submit_investigation')
+
+        # Act
+        response = client.post('/api/ai/investigate', headers=auth_headers, json={
+            'log_file_id': file_id,
+            'question': 'Any blocked requests?',
+            'async': True
+        })
+
+        # Assert
+        assert response.status_code == 501
+        submit.assert_not_called()
+
+    def test_should_return_404_when_investigation_polled_by_another_user(
+        self, client, auth_headers, log_file_with_entries, mocker
+    ):
+        # Arrange
+        file_id = str(log_file_with_entries('completed'))
+        mocker.patch('routes.ai.AIService.investigate', return_value={'answer': 'done'})
+        mocker.patch('routes.ai._job_state_is_shared', return_value=True)
+        mocker.patch('routes.ai._get_job_executor', return_value=mocker.Mock(
+            submit=lambda fn, *args: fn(*args)
+        ))
+        queued = client.post('/api/ai/investigate', headers=auth_headers, json={
+            'log_file_id': file_id,
+            'question': 'Any blocked requests?',
+            'async': True
+        })
+        other = User(email='other@example.com', password='otherpassword123')
+        db.session.add(other)
+        db.session.commit()
+        other_headers = {'Authorization': f'Bearer {create_access_token(identity=str(other.id))}'}
+
+        # Act
+        response = client.get(queued.get_json()['status_url'], headers=other_headers)
+
+        # Assert
+        assert response.status_code == 404
+
+    def test_should_answer_synchronously_when_async_not_requested(
+        self, client, auth_headers, log_file_with_entries, mocker
+    ):
+        # Arrange
+        file_id = str(log_file_with_entries('completed'))
+        mocker.patch('routes.ai.AIService.investigate', return_value={'answer': 'done'})
+
+        # Act
+        response = client.post('/api/ai/investigate', headers=auth_headers, json={
+            'log_file_id': file_id,
+            'question': 'Any blocked requests?'
+        })
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_json() == {'answer': 'done'}
+
+    def test_should_return_404_when_investigation_unknown(self, client, auth_headers):
+        # Act
+        response = client.get('/api/ai/investigate/does-not-exist', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 404
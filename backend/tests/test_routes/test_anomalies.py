@@ -0,0 +1,205 @@
+"""Tests for anomalies routes."""
+import uuid
+import pytest
+from datetime import datetime
+from models import LogFile, LogFileTimelineSummary
+from extensions import db
+from services.timeline_summary import build_timeline_summary
+
+
+@pytest.fixture
+def anomalous_log_file(log_file_with_entries):
+    """Create a log file with a mix of anomalous and normal entries."""
+    entries = [
+        (datetime(2022, 6, 20, 10, 1, 0), True, 'malicious_domain'),
+        (datetime(2022, 6, 20, 10, 7, 0), True, 'malicious_domain'),
+        (datetime(2022, 6, 20, 10, 14, 0), True, 'unusual_ua'),
+        (datetime(2022, 6, 20, 10, 20, 0), True, None),
+        (datetime(2022, 6, 20, 10, 21, 0), False, None),
+    ]
+    log_file_id = log_file_with_entries(
+        'completed',
+        [
+            dict(
+                timestamp=timestamp,
+                url='https://example.com',
+                domain='example.com',
+                action='Allowed',
+                is_anomalous=is_anomalous,
+                anomaly_type=anomaly_type
+            )
+            for timestamp, is_anomalous, anomaly_type in entries
+        ],
+        filename='anomalies.log'
+    )
+    
+    # Completed files get their timeline summary at the end of ingestion
+    build_timeline_summary(log_file_id)
+    db.session.commit()
+    return str(log_file_id)
+
+
+class TestListAnomalies:
+    """Tests for /api/anomalies endpoint."""
+
+    def test_should_page_through_anomalies_when_cursor_provided(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Arrange
+        url = f'/api/anomalies?log_file_id={anomalous_log_file}&min_confidence=0&limit=3'
+
+        # Act
+        first = client.get(f'{url}&cursor=', headers=auth_headers).get_json()
+        second = client.get(f"{url}&cursor={first['next_cursor']}", headers=auth_headers).get_json()
+
+        # Assert
+        first_times = [a['log_entry']['timestamp'] for a in first['anomalies']]
+        second_times = [a['log_entry']['timestamp'] for a in second['anomalies']]
+        assert first['has_more'] is True
+        assert first_times == ['2022-06-20T10:20:00', '2022-06-20T10:14:00', '2022-06-20T10:07:00']
+        assert second_times == ['2022-06-20T10:01:00']
+        assert second['has_more'] is False
+        assert second['next_cursor'] is None
+        assert 'total' not in second
+
+    def test_should_return_one_anomaly_when_cursor_limit_zero(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/anomalies?log_file_id={anomalous_log_file}&min_confidence=0&cursor=&limit=0',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data['anomalies']) == 1
+        assert data['has_more'] is True
+
+    def test_should_return_total_when_page_pagination_used(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/anomalies?log_file_id={anomalous_log_file}&min_confidence=0&page=1&limit=2',
+            headers=auth_headers
+        )
+
+        # Assert
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['total'] == 4
+        assert len(data['anomalies']) == 2
+
+    def test_should_omit_large_text_columns_when_full_not_requested(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/anomalies?log_file_id={anomalous_log_file}&min_confidence=0',
+            headers=auth_headers
+        )
+
+        # Assert
+        log_entry = response.get_json()['anomalies'][0]['log_entry']
+        assert log_entry['log_file_id'] == anomalous_log_file
+        assert log_entry['domain'] == 'example.com'
+        assert 'url' not in log_entry
+        assert 'user_agent' not in log_entry
+
+    def test_should_return_full_log_entries_when_full_requested(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/anomalies?log_file_id={anomalous_log_file}&min_confidence=0&full=1',
+            headers=auth_headers
+        )
+
+        # Assert
+        log_entry = response.get_json()['anomalies'][0]['log_entry']
+        assert log_entry['url'] == 'https://example.com'
+
+    def test_should_reject_log_file_id_when_malformed(self, client, auth_headers):
+        # Act
+        response = client.get('/api/anomalies?log_file_id=not-a-uuid', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+
+    def test_should_reject_cursor_when_malformed(self, client, auth_headers):
+        # Act
+        response = client.get('/api/anomalies?cursor=not-a-cursor', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+
+
+class TestAnomalyTimeline:
+    """Tests for /api/anomalies/timeline endpoint."""
+
+    def test_should_aggregate_anomalies_into_buckets_when_entries_exist(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/anomalies/timeline?log_file_id={anomalous_log_file}&bucket_minutes=15',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        buckets = response.get_json()['buckets']
+        assert buckets == [
+            {
+                'time': '2022-06-20T10:00:00',
+                'count': 3,
+                'by_type': {'malicious_domain': 2, 'unusual_ua': 1}
+            },
+            {
+                'time': '2022-06-20T10:15:00',
+                'count': 1,
+                'by_type': {'unknown': 1}
+            }
+        ]
+
+    def test_should_aggregate_raw_entries_when_file_still_processing(
+        self, app, client, auth_headers, anomalous_log_file
+    ):
+        # Arrange
+        with app.app_context():
+            db.session.get(LogFile, uuid.UUID(anomalous_log_file)).status = 'processing'
+            LogFileTimelineSummary.query.delete()
+            db.session.commit()
+
+        # Act
+        response = client.get(
+            f'/api/anomalies/timeline?log_file_id={anomalous_log_file}&bucket_minutes=15',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert [b['count'] for b in response.get_json()['buckets']] == [3, 1]
+
+    def test_should_aggregate_raw_entries_when_bucket_not_summary_multiple(
+        self, client, auth_headers, anomalous_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/anomalies/timeline?log_file_id={anomalous_log_file}&bucket_minutes=7',
+            headers=auth_headers
+        )
+
+        # Assert
+        buckets = response.get_json()['buckets']
+        assert [b['time'] for b in buckets] == [
+            '2022-06-20T09:56:00', '2022-06-20T10:03:00', '2022-06-20T10:10:00', '2022-06-20T10:17:00'
+        ]
+
+    def test_should_reject_bucket_minutes_when_not_positive(self, client, auth_headers):
+        # Act
+        response = client.get('/api/anomalies/timeline?bucket_minutes=0', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
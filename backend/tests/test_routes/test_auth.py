@@ -1,6 +1,7 @@
 """Tests for authentication routes."""
 import pytest
 from flask import json
+from werkzeug.security import generate_password_hash
 from models import User
 from extensions import db
 
@@ -29,6 +30,27 @@ class TestAuthRoutes:
         assert data['user']['email'] == sample_user_data['email']
         assert 'id' in data['user']
     
+    def test_should_upgrade_legacy_hash_when_login_succeeds(self, app, client, sample_user_data):
+        # Arrange
+        with app.app_context():
+            user = User(email=sample_user_data['email'], password=sample_user_data['password'])
+            # Single-iteration pbkdf2 keeps the legacy hash cheap to build and check
+            user.password_hash = generate_password_hash(sample_user_data['password'], method='pbkdf2:sha256:1')
+            db.session.add(user)
+            db.session.commit()
+        
+        # Act
+        response = client.post('/api/auth/login', json={
+            'email': sample_user_data['email'],
+            'password': sample_user_data['password']
+        })
+        
+        # Assert
+        assert response.status_code == 200
+        with app.app_context():
+            user = User.query.filter_by(email=sample_user_data['email']).first()
+            assert user.password_hash.startswith('$argon2')
+    
     def test_should_reject_login_when_invalid_password(self, app, client, sample_user_data):
         # Arrange
         with app.app_context():
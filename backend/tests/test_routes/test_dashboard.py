@@ -0,0 +1,387 @@
+"""Tests for dashboard routes."""
+import uuid
+import pytest
+from datetime import datetime
+from models import LogEntry, LogFile, User, UserRiskScore
+from extensions import db
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+from services.dashboard_rollups import build_dashboard_rollups
+from routes.dashboard import TIMELINE_V2_FILE_SQL, TIMELINE_V2_SQL
+
+
+@pytest.fixture
+def dashboard_log_file(log_file_with_entries):
+    """Create a log file with entries spread over two 15-minute buckets."""
+    entries = [
+        (datetime(2022, 6, 20, 10, 1, 0), 'Allowed'),
+        (datetime(2022, 6, 20, 10, 7, 0), 'Blocked'),
+        (datetime(2022, 6, 20, 10, 14, 59), 'Allowed'),
+        (datetime(2022, 6, 20, 10, 15, 0), 'Blocked'),
+    ]
+    log_file_id = log_file_with_entries(
+        'completed',
+        [
+            dict(
+                timestamp=timestamp,
+                url='https://example.com',
+                domain='example.com',
+                action=action,
+                resp_size=100,
+                is_anomalous=action == 'Blocked'
+            )
+            for timestamp, action in entries
+        ],
+        filename='dashboard.log',
+        date_range_start=datetime(2022, 6, 20, 10, 1, 0),
+        date_range_end=datetime(2022, 6, 20, 10, 15, 0)
+    )
+    
+    # Completed files get their rollups at the end of ingestion
+    build_dashboard_rollups(log_file_id)
+    db.session.commit()
+    return str(log_file_id)
+
+
+class TestStats:
+    """Tests for /api/dashboard/stats endpoint."""
+
+    def test_should_return_entry_totals_when_entries_exist(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/dashboard/stats?log_file_id={dashboard_log_file}',
+            headers=auth_headers
+        )
+
+        # Assert
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['total_requests'] == 4
+        assert data['blocked_events'] == 2
+        assert data['malicious_urls'] == 2
+        assert data['data_transfer_bytes'] == 400
+        assert data['high_risk_users'] == 0
+
+
+class TestTimeline:
+    """Tests for /api/dashboard/timeline endpoint."""
+
+    def test_should_bucket_entries_when_entries_exist(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/dashboard/timeline?log_file_id={dashboard_log_file}&bucket_minutes=15',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_json()['buckets'] == [
+            {'time': '2022-06-20T10:00:00', 'total': 3, 'blocked': 1},
+            {'time': '2022-06-20T10:15:00', 'total': 1, 'blocked': 1}
+        ]
+
+    def test_should_reject_bucket_minutes_when_not_positive(self, client, auth_headers):
+        # Act
+        response = client.get('/api/dashboard/timeline?bucket_minutes=0', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+
+
+class TestTimelineV2:
+    """Tests for /api/dashboard/timeline/v2 served from rollups."""
+
+    def test_should_roll_up_buckets_when_file_completed(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/dashboard/timeline/v2?log_file_id={dashboard_log_file}&bucket_minutes=15',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        buckets = response.get_json()['buckets']
+        assert [(b['time'], b['total'], b['blocked']) for b in buckets] == [
+            ('2022-06-20T10:00:00', 3, 1),
+            ('2022-06-20T10:15:00', 1, 1)
+        ]
+        assert buckets[0]['log_count'] == 3
+        assert buckets[0]['blocked_count'] == 1
+
+    def test_should_include_empty_buckets_when_range_has_gaps(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/dashboard/timeline/v2?log_file_id={dashboard_log_file}&bucket_minutes=5'
+            '&start_time=2022-06-20T10:00:00&end_time=2022-06-20T10:20:00',
+            headers=auth_headers
+        )
+
+        # Assert
+        buckets = response.get_json()['buckets']
+        assert [b['total'] for b in buckets] == [1, 1, 1, 1, 0]
+
+
+class TestTopN:
+    """Tests for the top-N endpoints served from rollups."""
+
+    def test_should_return_top_domains_when_file_completed(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/dashboard/top-domains?log_file_id={dashboard_log_file}',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.get_json()['domains'] == [
+            {'domain': 'example.com', 'count': 4, 'blocked_count': 2}
+        ]
+
+    def test_should_count_blocked_domains_when_aggregating_raw_entries(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act - no log_file_id, so there is no rollup to read
+        response = client.get('/api/dashboard/top-domains', headers=auth_headers)
+
+        # Assert
+        assert response.get_json()['domains'] == [
+            {'domain': 'example.com', 'count': 4, 'blocked_count': 2}
+        ]
+
+    def test_should_label_null_values_unknown_when_file_completed(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        categories = client.get(
+            f'/api/dashboard/top-categories?log_file_id={dashboard_log_file}',
+            headers=auth_headers
+        ).get_json()['categories']
+        users = client.get(
+            f'/api/dashboard/top-users?log_file_id={dashboard_log_file}',
+            headers=auth_headers
+        ).get_json()['users']
+
+        # Assert
+        assert categories == [{'name': 'Unknown', 'count': 4, 'percentage': 100.0}]
+        assert users == [{'identifier': 'Unknown', 'request_count': 4, 'risk_score': 0}]
+
+    def test_should_attach_risk_scores_when_top_users_requested(
+        self, app, client, auth_headers, dashboard_log_file
+    ):
+        # Arrange - entries have no department, stored under the '' identifier
+        with app.app_context():
+            db.session.add(UserRiskScore(
+                log_file_id=uuid.UUID(dashboard_log_file),
+                user_identifier='',
+                risk_score=42.5
+            ))
+            db.session.commit()
+
+        # Act
+        users = client.get(
+            f'/api/dashboard/top-users?log_file_id={dashboard_log_file}',
+            headers=auth_headers
+        ).get_json()['users']
+
+        # Assert
+        assert users == [{'identifier': 'Unknown', 'request_count': 4, 'risk_score': 42.5}]
+
+
+class TestTopCategories:
+    """Tests for /api/dashboard/top-categories percentages."""
+
+    @pytest.mark.parametrize('status', ['processing', 'completed'])
+    def test_should_compute_percentage_of_all_entries_when_limited(
+        self, app, client, auth_headers, sample_user_data, status
+    ):
+        # Arrange - three entries, two in 'News'; only the top category is returned
+        with app.app_context():
+            user = User.query.filter_by(email=sample_user_data['email']).first()
+            log_file = LogFile(filename='categories.log', uploaded_by=user.id, status=status)
+            db.session.add(log_file)
+            db.session.commit()
+            db.session.execute(insert(LogEntry), [
+                dict(
+                    log_file_id=log_file.id,
+                    timestamp=datetime(2022, 6, 20, 10, 0, 0),
+                    url='https://example.com',
+                    url_cat=url_cat
+                )
+                for url_cat in ('News', 'News', 'Sports')
+            ])
+            db.session.commit()
+            if status == 'completed':
+                build_dashboard_rollups(log_file.id)
+                db.session.commit()
+            log_file_id = log_file.id
+
+        # Act
+        categories = client.get(
+            f'/api/dashboard/top-categories?log_file_id={log_file_id}&limit=1',
+            headers=auth_headers
+        ).get_json()['categories']
+
+        # Assert
+        assert len(categories) == 1
+        assert categories[0]['name'] == 'News'
+        assert categories[0]['count'] == 2
+        assert categories[0]['percentage'] == pytest.approx(200 / 3)
+
+
+class TestSummary:
+    """Tests for /api/dashboard/summary endpoint."""
+
+    def test_should_match_individual_endpoints_when_summary_requested(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Arrange
+        query = f'log_file_id={dashboard_log_file}&limit=5&bucket_minutes=15'
+        expected = {
+            name: client.get(f'/api/dashboard/{endpoint}?{query}', headers=auth_headers).get_json()
+            for name, endpoint in [
+                ('stats', 'stats'),
+                ('timeline', 'timeline'),
+                ('top_categories', 'top-categories'),
+                ('top_domains', 'top-domains'),
+                ('top_users', 'top-users'),
+            ]
+        }
+
+        # Act
+        response = client.get(f'/api/dashboard/summary?{query}', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_json() == expected
+        assert expected['stats']['total_requests'] == 4
+
+    def test_should_return_400_when_bucket_minutes_invalid(self, client, auth_headers):
+        # Act
+        response = client.get('/api/dashboard/summary?bucket_minutes=0', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+
+
+class TestRecentLogs:
+    """Tests for /api/dashboard/recent-logs endpoint."""
+
+    def test_should_page_entries_when_cursor_followed(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        first = client.get(
+            f'/api/dashboard/recent-logs?log_file_id={dashboard_log_file}&limit=3',
+            headers=auth_headers
+        ).get_json()
+        second = client.get(
+            f'/api/dashboard/recent-logs?log_file_id={dashboard_log_file}&limit=3'
+            f'&cursor={first["next_cursor"]}',
+            headers=auth_headers
+        ).get_json()
+
+        # Assert
+        assert [e['timestamp'] for e in first['entries']] == [
+            '2022-06-20T10:15:00', '2022-06-20T10:14:59', '2022-06-20T10:07:00'
+        ]
+        assert first['has_more'] is True
+        assert [e['timestamp'] for e in second['entries']] == ['2022-06-20T10:01:00']
+        assert second['has_more'] is False
+        assert second['next_cursor'] is None
+
+    def test_should_serialize_like_to_dict_when_entries_returned(
+        self, app, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        entries = client.get(
+            f'/api/dashboard/recent-logs?log_file_id={dashboard_log_file}&limit=1',
+            headers=auth_headers
+        ).get_json()['entries']
+
+        # Assert
+        with app.app_context():
+            entry = db.session.get(LogEntry, uuid.UUID(entries[0]['id']))
+            assert entries[0] == entry.to_dict()
+
+    def test_should_return_one_entry_when_limit_zero(
+        self, client, auth_headers, dashboard_log_file
+    ):
+        # Act
+        response = client.get(
+            f'/api/dashboard/recent-logs?log_file_id={dashboard_log_file}&limit=0',
+            headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data['entries']) == 1
+        assert data['has_more'] is True
+
+    def test_should_return_400_when_cursor_invalid(self, client, auth_headers):
+        # Act
+        response = client.get('/api/dashboard/recent-logs?cursor=not-a-cursor', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+
+
+class TestLogFileIdValidation:
+    """Tests for log_file_id validation across dashboard endpoints."""
+
+    @pytest.mark.parametrize('endpoint', [
+        'stats', 'timeline', 'timeline/v2', 'top-categories', 'top-domains',
+        'top-users', 'recent-logs', 'summary'
+    ])
+    def test_should_return_400_when_log_file_id_invalid(self, client, auth_headers, endpoint):
+        # Act
+        response = client.get(f'/api/dashboard/{endpoint}?log_file_id=not-a-uuid', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid log_file_id format'}
+
+
+class TestTimelineV2Output:
+    """Tests for /timeline/v2 logging and debug output."""
+
+    def test_should_not_write_to_stdout_when_query_runs(self, client, auth_headers, capsys):
+        # Act - the raw query is PostgreSQL-only, so it fails on SQLite
+        response = client.get('/api/dashboard/timeline/v2', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 500
+        assert 'details' not in response.get_json()
+        assert capsys.readouterr().out == ''
+
+    def test_should_include_traceback_when_debug_query_requested(self, client, auth_headers):
+        # Act
+        response = client.get('/api/dashboard/timeline/v2?debug_query=true', headers=auth_headers)
+
+        # Assert
+        assert 'Traceback' in response.get_json()['details']
+
+
+class TestTimelineV2Sql:
+    """Tests for the precompiled /timeline/v2 statements."""
+
+    @pytest.mark.parametrize('statement, params', [
+        (TIMELINE_V2_SQL, {'start_time', 'end_time', 'bucket_minutes'}),
+        (TIMELINE_V2_FILE_SQL, {'start_time', 'end_time', 'bucket_minutes', 'log_file_id'}),
+    ])
+    def test_should_bind_bucket_width_when_statement_built(self, statement, params):
+        # Act
+        compiled = statement.compile(dialect=postgresql.dialect())
+
+        # Assert - no per-request values are baked into the SQL text
+        assert set(compiled.params) == params
+        assert "interval '" not in str(compiled)
@@ -131,11 +131,11 @@ class TestAuthEndpointsIntegration:
         # Assert
         assert response.status_code == 422  # JWT decode error
     
-    def test_should_logout_when_authenticated(self, authenticated_session, api_base_url):
+    def test_should_logout_when_authenticated(self, revoking_session, api_base_url):
         # Arrange - using authenticated session
         
         # Act
-        response = authenticated_session.post(
+        response = revoking_session.post(
             f'{api_base_url}/api/auth/logout',
             timeout=10
         )
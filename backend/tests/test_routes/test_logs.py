@@ -0,0 +1,317 @@
+"""Tests for log ingestion."""
+import io
+import threading
+import time
+import uuid
+import zipfile
+import pytest
+from datetime import datetime
+from models import LogEntry, LogFile, UserRiskScore
+from extensions import db
+from routes import logs
+from routes.logs import _iter_log_lines, _peek_magic, _process_log_file, _process_log_file_async
+
+LOG_LINE = '"Mon Jun 20 12:00:00 2022","ny-gre","HTTP","example.com/","Allowed","Ebay","Consumer Apps","72","14061","0","0","Productivity Loss","Shopping and Auctions","Online Shopping","None","None","0","None","None","ny-gre","Default Department","172.17.3.49","66.211.175.229","GET","403","curl/7.68.0","None","FwFilter","Firewall_1","Other","None","NA","NA","N/A"'
+
+
+@pytest.fixture
+def processing_log_file(log_file_with_entries):
+    """Create a log file waiting to be ingested."""
+    return log_file_with_entries('processing', filename='upload.log')
+
+
+def _upload(content: bytes, filename: str) -> io.BytesIO:
+    file = io.BytesIO(content)
+    file.filename = filename
+    return file
+
+
+class TestProcessLogFile:
+    """Tests for _process_log_file."""
+
+    def test_should_insert_entries_when_plain_file_processed(self, app, processing_log_file):
+        # Arrange
+        content = f'{LOG_LINE}\n\nnot a log line\n{LOG_LINE}\n'.encode('utf-8')
+
+        # Act
+        _process_log_file(processing_log_file, _upload(content, 'upload.log'))
+
+        # Assert
+        log_file = db.session.get(LogFile, processing_log_file)
+        assert log_file.status == 'completed'
+        assert log_file.total_entries == 2
+        entries = LogEntry.query.filter_by(log_file_id=processing_log_file).all()
+        assert len(entries) == 2
+        assert entries[0].domain == 'example.com'
+        assert entries[0].anomaly_type == 'unusual_ua'
+        assert entries[0].created_at is not None
+        risk_score = UserRiskScore.query.filter_by(log_file_id=processing_log_file).one()
+        assert risk_score.user_identifier == 'Default Department'
+        assert risk_score.anomaly_count == 2
+
+    def test_should_stream_log_members_when_zip_processed(self, app, processing_log_file):
+        # Arrange
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr('logs/a.log', f'{LOG_LINE}\n{LOG_LINE}\n')
+            zip_ref.writestr('logs/b.csv', f'{LOG_LINE}\n')
+            zip_ref.writestr('logs/readme.md', f'{LOG_LINE}\n')
+
+        # Act
+        _process_log_file(processing_log_file, _upload(archive.getvalue(), 'upload.zip'))
+
+        # Assert - the .md member is ignored
+        log_file = db.session.get(LogFile, processing_log_file)
+        assert log_file.status == 'completed'
+        assert LogEntry.query.filter_by(log_file_id=processing_log_file).count() == 3
+
+    def test_should_raise_when_zip_corrupted(self, app, processing_log_file):
+        # Act & Assert
+        with pytest.raises(ValueError, match='Invalid or corrupted zip file'):
+            _process_log_file(processing_log_file, _upload(b'PK\x03\x04garbage', 'upload.zip'))
+
+
+class TestProcessLogFileAsync:
+    """Tests for _process_log_file_async."""
+
+    def test_should_process_and_delete_spooled_upload_when_done(self, app, processing_log_file, tmp_path):
+        # Arrange
+        file_path = tmp_path / 'spooled.upload'
+        file_path.write_bytes(f'{LOG_LINE}\n'.encode('utf-8'))
+
+        # Act
+        _process_log_file_async(app, processing_log_file, str(file_path), 'upload.log')
+
+        # Assert
+        assert db.session.get(LogFile, processing_log_file).status == 'completed'
+        assert not file_path.exists()
+
+    def test_should_delete_spooled_upload_when_processing_fails(self, app, processing_log_file, tmp_path):
+        # Arrange
+        file_path = tmp_path / 'spooled.upload'
+        file_path.write_bytes(b'PK\x03\x04garbage')
+
+        # Act
+        _process_log_file_async(app, processing_log_file, str(file_path), 'upload.zip')
+
+        # Assert
+        assert db.session.get(LogFile, processing_log_file).status == 'failed'
+        assert not file_path.exists()
+
+
+class TestIterLogLines:
+    """Tests for _iter_log_lines."""
+
+    def test_should_decode_invalid_utf8_as_latin1_when_reading_lines(self):
+        # Arrange
+        stream = io.BytesIO(b'first\r\n\n  \ncaf\xc3\xa9\ncaf\xe9 latin\nlast')
+
+        # Act
+        lines = list(_iter_log_lines(stream))
+
+        # Assert - the stream stays open for the caller
+        assert lines == ['first', 'caf\u00e9', 'caf\u00e9 latin', 'last']
+        assert not stream.closed
+
+
+class TestPeekMagic:
+    """Tests for _peek_magic."""
+
+    @pytest.mark.parametrize('opener', [
+        lambda path: open(path, 'rb'),
+        lambda path: io.BytesIO(path.read_bytes()),
+    ])
+    def test_should_leave_file_at_start_when_peeking(self, tmp_path, opener):
+        # Arrange
+        path = tmp_path / 'archive.zip'
+        path.write_bytes(b'PK\x03\x04rest')
+
+        # Act
+        with opener(path) as file:
+            magic = _peek_magic(file)
+            content = file.read()
+
+        # Assert
+        assert magic == b'PK\x03\x04'
+        assert content == b'PK\x03\x04rest'
+
+
+@pytest.fixture
+def listed_log_file(log_file_with_entries):
+    """Create a completed log file with three entries a minute apart."""
+    return str(log_file_with_entries(
+        'completed',
+        [
+            dict(
+                timestamp=datetime(2022, 6, 20, 10, minute, 0),
+                url=f'https://example.com/{minute}',
+                domain='example.com',
+                action=action
+            )
+            for minute, action in ((1, 'Allowed'), (2, 'Blocked'), (3, 'Allowed'))
+        ],
+        filename='listed.log',
+        total_entries=3
+    ))
+
+
+class TestListLogEntries:
+    """Tests for /api/logs/entries endpoint."""
+
+    def test_should_return_page_with_file_total_when_page_requested(self, client, auth_headers, listed_log_file):
+        # Act
+        response = client.get(f'/api/logs/entries?log_file_id={listed_log_file}&limit=2', headers=auth_headers)
+
+        # Assert
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['total'] == 3
+        assert data['page'] == 1
+        assert [e['url'] for e in data['entries']] == ['https://example.com/3', 'https://example.com/2']
+        assert data['has_more'] is True
+
+    @pytest.mark.parametrize('limit', [0, -1])
+    def test_should_return_one_entry_when_limit_below_one(
+        self, client, auth_headers, listed_log_file, limit
+    ):
+        # Act
+        response = client.get(
+            f'/api/logs/entries?log_file_id={listed_log_file}&limit={limit}', headers=auth_headers
+        )
+
+        # Assert
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['limit'] == 1
+        assert [e['url'] for e in data['entries']] == ['https://example.com/3']
+        assert data['has_more'] is True
+
+    def test_should_count_matches_when_filtered(self, client, auth_headers, listed_log_file):
+        # Act
+        response = client.get(
+            f'/api/logs/entries?log_file_id={listed_log_file}&action=Blocked', headers=auth_headers
+        )
+
+        # Assert
+        data = response.get_json()
+        assert data['total'] == 1
+        assert [e['action'] for e in data['entries']] == ['Blocked']
+
+    def test_should_seek_to_next_page_when_cursor_given(self, client, auth_headers, listed_log_file):
+        # Arrange
+        first = client.get(
+            f'/api/logs/entries?log_file_id={listed_log_file}&limit=2', headers=auth_headers
+        ).get_json()
+
+        # Act
+        response = client.get(
+            f"/api/logs/entries?log_file_id={listed_log_file}&limit=2&cursor={first['next_cursor']}",
+            headers=auth_headers
+        )
+
+        # Assert
+        data = response.get_json()
+        assert [e['url'] for e in data['entries']] == ['https://example.com/1']
+        assert data['has_more'] is False
+        assert data['next_cursor'] is None
+        assert 'total' not in data
+
+    def test_should_return_400_when_cursor_invalid(self, client, auth_headers, listed_log_file):
+        # Act
+        response = client.get('/api/logs/entries?cursor=not-a-cursor', headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+
+
+def _wait_for_ingest(log_file_id, timeout=30):
+    """Poll a log file until its upload has finished processing."""
+    deadline = time.monotonic() + timeout
+    while True:
+        db.session.remove()
+        log_file = db.session.get(LogFile, log_file_id)
+        if log_file.status != 'processing' or time.monotonic() > deadline:
+            return log_file
+        time.sleep(0.1)
+
+
+class TestUploadLog:
+    """Tests for /api/logs/upload endpoint."""
+
+    def test_should_process_upload_in_background_when_accepted(self, app, client, auth_headers):
+        # Act
+        response = client.post(
+            '/api/logs/upload',
+            headers=auth_headers,
+            data={'file': (io.BytesIO(f'{LOG_LINE}\n'.encode('utf-8')), 'upload.log')},
+            content_type='multipart/form-data'
+        )
+
+        # Assert
+        assert response.status_code == 200
+        log_file = _wait_for_ingest(uuid.UUID(response.get_json()['log_file_id']))
+        assert log_file.status == 'completed'
+        assert log_file.total_entries == 1
+
+    def test_should_process_upload_in_worker_process_when_configured(
+        self, app, client, auth_headers, monkeypatch
+    ):
+        # Arrange - workers build a 'testing' app on this file-backed database
+        monkeypatch.setenv('TEST_DATABASE_URL', app.config['SQLALCHEMY_DATABASE_URI'])
+        app.config.update(LOG_INGEST_PROCESSES=1, CONFIG_NAME='testing')
+
+        # Act
+        response = client.post(
+            '/api/logs/upload',
+            headers=auth_headers,
+            data={'file': (io.BytesIO(f'{LOG_LINE}\n'.encode('utf-8')), 'upload.log')},
+            content_type='multipart/form-data'
+        )
+
+        # Assert
+        assert response.status_code == 200
+        log_file = _wait_for_ingest(uuid.UUID(response.get_json()['log_file_id']))
+        assert log_file.status == 'completed'
+        assert log_file.total_entries == 1
+
+    def test_should_fail_upload_and_replace_pool_when_worker_process_dies(
+        self, app, client, auth_headers, monkeypatch, tmp_path
+    ):
+        # Arrange
+        monkeypatch.setenv('TEST_DATABASE_URL', app.config['SQLALCHEMY_DATABASE_URI'])
+        app.config.update(LOG_INGEST_PROCESSES=1, CONFIG_NAME='testing', UPLOAD_DIR=str(tmp_path))
+        response = client.post(
+            '/api/logs/upload',
+            headers=auth_headers,
+            data={'file': (io.BytesIO(f'{LOG_LINE}\n'.encode('utf-8')), 'upload.log')},
+            content_type='multipart/form-data'
+        )
+        executor = logs._ingest_executor
+
+        # Act - kill the worker while it is still starting up
+        for process in list(executor._processes.values()):
+            process.kill()
+        log_file = _wait_for_ingest(uuid.UUID(response.get_json()['log_file_id']))
+
+        # Assert
+        assert log_file.status == 'failed'
+        assert list(tmp_path.iterdir()) == []
+        assert logs._ingest_executor is not executor
+
+    def test_should_return_429_when_ingest_queue_full(self, app, client, auth_headers, monkeypatch):
+        # Arrange
+        logs._get_ingest_executor()
+        monkeypatch.setattr(logs, '_ingest_slots', threading.BoundedSemaphore(1))
+        logs._ingest_slots.acquire()
+
+        # Act
+        response = client.post(
+            '/api/logs/upload',
+            headers=auth_headers,
+            data={'file': (io.BytesIO(f'{LOG_LINE}\n'.encode('utf-8')), 'upload.log')},
+            content_type='multipart/form-data'
+        )
+
+        # Assert - nothing was recorded for the refused upload
+        assert response.status_code == 429
+        assert LogFile.query.count() == 0
@@ -0,0 +1,60 @@
+"""Tests for the orjson JSON provider."""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from models import JSONType
+from sqlalchemy.dialects import sqlite
+
+
+def test_should_serialize_datetime_and_uuid_when_returned_from_view(app):
+    # Arrange
+    value = uuid.uuid4()
+    payload = {'id': value, 'time': datetime(2022, 6, 20, 10, 0, 0), 1: 'one'}
+
+    # Act
+    with app.test_request_context():
+        response = app.json.response(payload)
+
+    # Assert
+    assert response.mimetype == 'application/json'
+    assert response.get_data(as_text=True).endswith('\n')
+    assert app.json.loads(response.get_data()) == {
+        'id': str(value),
+        'time': '2022-06-20T10:00:00',
+        '1': 'one'
+    }
+
+
+def test_should_fall_back_to_default_when_type_unsupported_by_orjson(app):
+    # Act
+    result = app.json.dumps({'amount': Decimal('1.50')})
+
+    # Assert
+    assert result == '{"amount":"1.50"}'
+
+
+def test_should_round_trip_json_column_when_value_nested():
+    # Arrange
+    column_type = JSONType()
+    dialect = sqlite.dialect()
+    value = {'by_type': {'malicious_domain': 2}, 'ratio': 0.5, 'tags': ['a', 'b']}
+
+    # Act
+    stored = column_type.process_bind_param(value, dialect)
+    loaded = column_type.process_result_value(stored, dialect)
+
+    # Assert
+    assert loaded == value
+
+
+def test_should_format_datetime_as_iso_when_pretty_printing(app, monkeypatch):
+    # Arrange - non-compact output goes through the stdlib json module
+    monkeypatch.setattr(app.json, 'compact', False)
+    payload = {'time': datetime(2022, 6, 20, 10, 0, 0)}
+
+    # Act
+    with app.test_request_context():
+        response = app.json.response(payload)
+
+    # Assert
+    assert app.json.loads(response.get_data()) == {'time': '2022-06-20T10:00:00'}
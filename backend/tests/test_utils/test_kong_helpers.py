@@ -79,3 +79,18 @@ def test_should_raise_401_when_bearer_missing():
         assert exc_info.value.code == 401
         assert 'Missing or invalid Authorization' in str(exc_info.value.description)
 
+
+def test_should_raise_401_when_token_empty():
+    """Test that get_user_id_from_kong raises 401 when the Bearer token is empty."""
+    # Arrange
+    from utils.kong_helpers import get_user_id_from_kong
+    
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+    
+    with app.test_request_context(headers={'Authorization': 'Bearer '}):
+        # Act & Assert
+        with pytest.raises(Unauthorized) as exc_info:
+            get_user_id_from_kong()
+        
+        assert 'Missing JWT token' in str(exc_info.value.description)
@@ -0,0 +1,33 @@
+"""Tests for keyset pagination utilities."""
+import pytest
+from flask import Flask
+from utils.pagination import MAX_PAGE_SIZE, page_limit
+
+
+@pytest.mark.parametrize('query_string, expected', [
+    ('', 50),
+    ('limit=20', 20),
+    ('limit=0', 1),
+    ('limit=-1', 1),
+    ('limit=1000', MAX_PAGE_SIZE),
+    ('limit=abc', 50),
+])
+def test_should_clamp_limit_when_reading_page_size(query_string, expected):
+    # Arrange
+    app = Flask('unit')
+
+    # Act
+    with app.test_request_context(f'/?{query_string}'):
+        result = page_limit(50)
+
+    # Assert
+    assert result == expected
+
+
+def test_should_clamp_limit_to_maximum_when_given():
+    # Act
+    with Flask('unit').test_request_context('/?limit=80'):
+        result = page_limit(10, maximum=50)
+
+    # Assert
+    assert result == 50
@@ -0,0 +1,95 @@
+"""Tests for the response cache."""
+import pytest
+from datetime import datetime
+from models import LogEntry
+from extensions import cache, db
+from utils.response_cache import invalidate_log_file
+
+
+def _add_entry(log_file_id):
+    db.session.add(LogEntry(
+        log_file_id=log_file_id,
+        timestamp=datetime(2022, 6, 20, 12, 0, 0),
+        url='https://example.com',
+        domain='example.com',
+        action='Allowed'
+    ))
+    db.session.commit()
+
+
+def test_should_serve_cached_response_until_log_file_invalidated(
+    app, client, auth_headers, log_file_with_entries
+):
+    # Arrange
+    log_file_id = log_file_with_entries('processing', filename='cached.log')
+    url = f'/api/dashboard/stats?log_file_id={log_file_id}'
+    _add_entry(log_file_id)
+    first = client.get(url, headers=auth_headers).get_json()
+    _add_entry(log_file_id)
+
+    # Act
+    cached = client.get(url, headers=auth_headers).get_json()
+    invalidate_log_file(log_file_id)
+    fresh = client.get(url, headers=auth_headers).get_json()
+
+    # Assert
+    assert first['total_requests'] == 1
+    assert cached['total_requests'] == 1
+    assert fresh['total_requests'] == 2
+
+
+@pytest.mark.parametrize('spelling', [str.upper, lambda value: f'urn:uuid:{value}'])
+def test_should_invalidate_cached_response_when_log_file_id_spelled_differently(
+    app, client, auth_headers, log_file_with_entries, spelling
+):
+    # Arrange
+    log_file_id = log_file_with_entries('processing', filename='cached.log')
+    url = f'/api/dashboard/stats?log_file_id={spelling(str(log_file_id))}'
+    client.get(url, headers=auth_headers)
+    _add_entry(log_file_id)
+
+    # Act
+    invalidate_log_file(log_file_id)
+    response = client.get(url, headers=auth_headers).get_json()
+
+    # Assert
+    assert response['total_requests'] == 1
+
+
+def test_should_invalidate_unscoped_responses_when_any_log_file_invalidated(
+    app, client, auth_headers, log_file_with_entries
+):
+    # Arrange
+    log_file_id = log_file_with_entries('processing', filename='cached.log')
+    client.get('/api/dashboard/stats', headers=auth_headers)
+    _add_entry(log_file_id)
+
+    # Act
+    invalidate_log_file(log_file_id)
+    response = client.get('/api/dashboard/stats', headers=auth_headers).get_json()
+
+    # Assert
+    assert response['total_requests'] == 1
+
+
+def test_should_require_authentication_when_response_cached(client, auth_headers):
+    # Arrange
+    client.get('/api/dashboard/stats', headers=auth_headers)
+
+    # Act
+    response = client.get('/api/dashboard/stats')
+
+    # Assert
+    assert response.status_code == 401
+
+
+def test_should_not_cache_error_responses(client, auth_headers):
+    # Arrange
+    url = '/api/dashboard/timeline?bucket_minutes=0'
+
+    # Act
+    response = client.get(url, headers=auth_headers)
+
+    # Assert
+    assert response.status_code == 400
+    assert cache.get(f'response:0:{url}') is None
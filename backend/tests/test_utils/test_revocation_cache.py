@@ -0,0 +1,74 @@
+"""Tests for the token version cache."""
+import pytest
+from extensions import cache, db
+from models import User
+from utils import revocation_cache
+from utils.revocation_cache import get_jwt_version, is_token_revoked, set_jwt_version
+
+
+@pytest.fixture(autouse=True)
+def clear_revocation_cache(app):
+    revocation_cache._local.clear()
+    cache.clear()
+    yield
+    revocation_cache._local.clear()
+
+
+@pytest.fixture
+def user(app, sample_user_data):
+    user = User(email=sample_user_data['email'], password=sample_user_data['password'])
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_should_cache_version_when_looked_up(app, user):
+    # Arrange
+    first = get_jwt_version(user.id)
+    db.session.query(User).filter(User.id == user.id).update({'jwt_version': 5})
+    db.session.commit()
+
+    # Act
+    second = get_jwt_version(user.id)
+
+    # Assert - the second answer comes from the cache, not the updated row
+    assert first == 0
+    assert second == 0
+
+
+def test_should_override_cached_version_when_set(app, user):
+    # Arrange
+    get_jwt_version(user.id)
+
+    # Act
+    set_jwt_version(user.id, 1)
+
+    # Assert
+    assert get_jwt_version(user.id) == 1
+    assert is_token_revoked({'sub': str(user.id), 'ver': 0}) is True
+    assert is_token_revoked({'sub': str(user.id), 'ver': 1}) is False
+
+
+def test_should_treat_missing_ver_claim_as_zero(app, user):
+    # Act & Assert
+    assert is_token_revoked({'sub': str(user.id)}) is False
+
+
+def test_should_not_revoke_when_user_unknown(app):
+    # Act & Assert
+    assert is_token_revoked({'sub': '00000000-0000-0000-0000-000000000000', 'ver': 0}) is False
+
+
+def test_should_reject_token_when_logged_out(client, user, sample_user_data):
+    # Arrange - a successful request caches the current version
+    login = client.post('/api/auth/login', json=sample_user_data)
+    headers = {'Authorization': f"Bearer {login.get_json()['token']}"}
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+    # Act
+    client.post('/api/auth/logout', headers=headers)
+    response = client.get('/api/auth/me', headers=headers)
+
+    # Assert
+    assert response.status_code == 401
+    assert db.session.get(User, user.id).jwt_version == 1
@@ -0,0 +1,19 @@
+"""Tests for SQL helper utilities."""
+from extensions import db
+from utils.sql_helpers import no_autoflush
+
+
+def test_should_disable_autoflush_when_view_decorated(app):
+    # Arrange
+    @no_autoflush
+    def view():
+        return db.session.autoflush
+
+    # Act
+    with app.app_context():
+        inside = view()
+        after = db.session.autoflush
+
+    # Assert
+    assert inside is False
+    assert after is True
@@ -0,0 +1,29 @@
+"""Tests for timestamp helper utilities."""
+from datetime import datetime, timezone
+import pytest
+from utils.time_helpers import parse_iso_datetime
+
+
+def test_should_parse_utc_when_timestamp_ends_with_z():
+    # Act
+    result = parse_iso_datetime('2024-01-15T10:30:00Z')
+
+    # Assert
+    assert result == datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+
+
+def test_should_parse_naive_datetime_when_no_offset():
+    # Act
+    result = parse_iso_datetime('2024-01-15T10:30:00')
+
+    # Assert
+    assert result == datetime(2024, 1, 15, 10, 30)
+
+
+@pytest.mark.parametrize('value', ['not-a-date', '', '2024-01-15T' + '0' * 100, None, 123])
+def test_should_return_none_when_timestamp_invalid(value):
+    # Act
+    result = parse_iso_datetime(value)
+
+    # Assert
+    assert result is None
@@ -0,0 +1,43 @@
+"""Tests for UUID helper utilities."""
+import uuid
+import pytest
+from werkzeug.exceptions import HTTPException
+from utils.uuid_helpers import parse_log_file_id, parse_uuid
+
+
+def test_should_parse_uuid_when_valid_string():
+    # Arrange
+    value = uuid.uuid4()
+
+    # Act
+    result = parse_uuid(str(value))
+
+    # Assert
+    assert result == value
+
+
+@pytest.mark.parametrize('value', ['not-a-uuid', '', 'a' * 1000, None, 123])
+def test_should_return_none_when_value_invalid(value):
+    # Act
+    result = parse_uuid(value)
+
+    # Assert
+    assert result is None
+
+
+def test_should_return_none_when_log_file_id_absent():
+    # Act & Assert
+    assert parse_log_file_id(None) is None
+    assert parse_log_file_id('') is None
+
+
+def test_should_abort_400_when_log_file_id_invalid(app):
+    # Act
+    with app.test_request_context():
+        with pytest.raises(HTTPException) as exc_info:
+            parse_log_file_id('not-a-uuid')
+
+    # Assert
+    response = exc_info.value.get_response()
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid log_file_id format'}
@@ -0,0 +1,54 @@
+"""orjson-backed JSON provider for Flask."""
+from datetime import date
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Options shared by API responses and JSONType columns. Non-string dict keys
+# are stringified like the stdlib json module does.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(o):
+    """Serialize types orjson doesn't handle, formatting dates like orjson does."""
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson.
+
+    orjson handles datetime, date, UUID and dataclasses natively (datetimes
+    as ISO 8601 rather than Flask's HTTP date format), so views can return
+    them without converting each value; anything else falls back to
+    DefaultJSONProvider.default. Calls passing stdlib json keyword
+    arguments (e.g. indent), and pretty-printed debug responses, are
+    delegated to the stdlib implementation, which also writes dates as
+    ISO 8601.
+    """
+    default = staticmethod(_default)
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _options(self):
+        if self.sort_keys:
+            return ORJSON_OPTIONS | orjson.OPT_SORT_KEYS
+        return ORJSON_OPTIONS
@@ -3,6 +3,7 @@ import uuid
 from flask import request
 from werkzeug.exceptions import Unauthorized
 from flask_jwt_extended import decode_token
+from utils.revocation_cache import is_token_revoked
 
 
 def get_user_id_from_kong():
@@ -10,14 +11,14 @@ def get_user_id_from_kong():
     Extract and validate user ID from JWT token in Authorization header.
     
     Kong validates the JWT token for authentication. This function decodes
-    the token to extract the user ID from the 'sub' claim and checks if
-    the token has been blacklisted (logged out).
+    the token to extract the user ID from the 'sub' claim and checks its
+    'ver' claim against the user's jwt_version (bumped on logout).
     
     Returns:
         uuid.UUID: The validated user ID.
         
     Raises:
-        Unauthorized: If the Authorization header is missing, token is invalid, or blacklisted.
+        Unauthorized: If the Authorization header is missing, token is invalid, or revoked.
     """
     # Get Authorization header
     auth_header = request.headers.get('Authorization')
@@ -26,7 +27,7 @@ def get_user_id_from_kong():
         raise Unauthorized(description='Missing or invalid Authorization header')
     
     # Extract token
-    token = auth_header.split(' ', 1)[1] if len(auth_header.split(' ')) > 1 else None
+    token = auth_header[len('Bearer '):]
     
     if not token:
         raise Unauthorized(description='Missing JWT token')
@@ -35,17 +36,13 @@ def get_user_id_from_kong():
         # Decode token to get claims (Kong already validated it)
         decoded = decode_token(token)
         user_id_str = decoded.get('sub')
-        jti = decoded.get('jti')
         
         if not user_id_str:
             raise Unauthorized(description='Missing user ID in token')
         
-        # Check if token is blacklisted (user logged out)
-        if jti:
-            from models import TokenBlacklist
-            blacklisted = TokenBlacklist.query.filter_by(jti=jti).first()
-            if blacklisted:
-                raise Unauthorized(description='Token has been revoked (logged out)')
+        # Reject tokens issued before the user's last logout (version is cached)
+        if is_token_revoked(decoded):
+            raise Unauthorized(description='Token has been revoked (logged out)')
         
         user_id = uuid.UUID(user_id_str)
         return user_id
@@ -0,0 +1,62 @@
+"""Keyset pagination cursors."""
+import base64
+import uuid
+from datetime import datetime
+from flask import request
+from sqlalchemy import Select
+from extensions import db
+
+# Largest page size a list endpoint serves unless it sets its own
+MAX_PAGE_SIZE = 100
+
+
+def page_limit(default: int, maximum: int = MAX_PAGE_SIZE) -> int:
+    """
+    Read the ?limit= page size, clamped to 1..maximum.
+    
+    Non-integer values fall back to the default.
+    """
+    limit = request.args.get('limit', default, type=int)
+    return min(max(limit, 1), maximum)
+
+
+def fetch_keyset_page(query, limit: int):
+    """
+    Fetch one page of an ordered (timestamp, id) query.
+    
+    One extra row is fetched to know whether another page exists.
+    
+    Args:
+        query: Ordered legacy Query or select() statement
+        limit: Page size, as returned by page_limit()
+        
+    Returns:
+        Tuple of (rows, next_cursor, has_more); next_cursor is None on the
+        last page
+    """
+    limited = query.limit(limit + 1)
+    if isinstance(limited, Select):
+        rows = db.session.execute(limited).all()
+    else:
+        rows = limited.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]) if has_more else None, has_more
+
+
+def encode_cursor(entry):
+    """Encode an entry's (timestamp, id) sort key as an opaque cursor."""
+    raw = f"{entry.timestamp.isoformat()}|{entry.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    timestamp_str, id_str = raw.split('|', 1)
+    return datetime.fromisoformat(timestamp_str), uuid.UUID(id_str)
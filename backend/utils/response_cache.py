@@ -0,0 +1,55 @@
+"""Short-lived caching of read-only JSON responses."""
+import time
+from functools import wraps
+from flask import current_app, request
+from extensions import cache
+from utils.uuid_helpers import parse_uuid
+
+# Default seconds a cached response is served
+RESPONSE_CACHE_TIMEOUT = 60
+
+# Generation key for responses not scoped to one log file
+_ALL_FILES = '*'
+
+
+def cached_response(view):
+    """
+    Cache a GET view's successful responses, keyed by path and query string.
+
+    Views must be authenticated before this runs (e.g. by a blueprint
+    before_request hook), so cached responses are only served to
+    authenticated callers. Keys include the generation of the
+    requested log_file_id (or of all files when none is given), which
+    invalidate_log_file() bumps once a file's ingestion finishes. The ID is
+    normalized first, so every spelling of it shares one generation.
+    Responses are the same for every user, so the user is not part of the key.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        file_uuid = parse_uuid(request.args.get('log_file_id'))
+        log_file_id = str(file_uuid) if file_uuid else _ALL_FILES
+        generation = cache.get(_generation_key(log_file_id)) or 0
+        key = f'response:{generation}:{request.full_path}'
+
+        cached = cache.get(key)
+        if cached is not None:
+            body, mimetype = cached
+            return current_app.response_class(body, mimetype=mimetype)
+
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            timeout = current_app.config.get('RESPONSE_CACHE_TIMEOUT', RESPONSE_CACHE_TIMEOUT)
+            cache.set(key, (response.get_data(), response.mimetype), timeout=timeout)
+        return response
+    return wrapper
+
+
+def invalidate_log_file(log_file_id) -> None:
+    """Stop serving cached responses that cover a log file."""
+    generation = time.time_ns()
+    cache.set(_generation_key(str(log_file_id)), generation, timeout=0)
+    cache.set(_generation_key(_ALL_FILES), generation, timeout=0)
+
+
+def _generation_key(log_file_id: str) -> str:
+    return f'response:generation:{log_file_id}'
@@ -0,0 +1,107 @@
+"""Cached lookups of revoked (logged out) JWTs."""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+from flask import current_app
+from extensions import cache, db
+
+# Default seconds a cached token version is trusted; bounds how long a token
+# logged out through another worker stays usable on this one when the cache
+# backend isn't shared
+REVOCATION_CACHE_TTL = 120
+REVOCATION_CACHE_MAXSIZE = 100_000
+
+
+class _TTLCache:
+    """Thread-safe, size-bounded dict whose entries expire individually."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = _TTLCache(REVOCATION_CACHE_MAXSIZE)
+
+
+def get_jwt_version(user_id) -> Optional[int]:
+    """
+    Look up a user's current token version.
+
+    Looks in an in-process cache, then the shared Flask-Caching backend
+    (Redis when configured), and only then in the users table.
+
+    Args:
+        user_id: ID of the user
+
+    Returns:
+        users.jwt_version, or None if the user doesn't exist
+    """
+    key = str(user_id)
+    version = _local.get(key)
+    if version is not None:
+        return version
+
+    version = cache.get(f'jwtver:{key}')
+    if version is None:
+        from models import User
+        version = db.session.query(User.jwt_version).filter(User.id == user_id).scalar()
+        if version is None:
+            return None
+
+    _store(key, version)
+    return version
+
+
+def set_jwt_version(user_id, version: int) -> None:
+    """
+    Publish a user's new token version to both cache layers.
+
+    The users row must be updated by the caller; this only stops cached
+    versions from being served.
+    """
+    _store(str(user_id), version)
+
+
+def is_token_revoked(claims: dict) -> bool:
+    """
+    Check whether decoded JWT claims were issued before the user's last logout.
+
+    Tokens minted before the 'ver' claim existed count as version 0.
+    """
+    user_id = claims.get('sub')
+    if not user_id:
+        return False
+    version = get_jwt_version(uuid.UUID(user_id))
+    return version is not None and claims.get('ver', 0) != version
+
+
+def _store(key: str, version: int) -> None:
+    """Cache a version in both layers."""
+    ttl = current_app.config.get('REVOCATION_CACHE_TTL', REVOCATION_CACHE_TTL)
+    _local.set(key, version, ttl)
+    cache.set(f'jwtver:{key}', version, timeout=ttl)
@@ -1,13 +1,45 @@
 """Security utilities."""
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash
+
+# Production Argon2id parameters; apps may override via the PASSWORD_HASHER
+# config key (TestingConfig uses a minimal-cost hasher)
+DEFAULT_PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
+ARGON2_PREFIX = '$argon2'
+
+
+def _get_password_hasher() -> PasswordHasher:
+    """Return the configured password hasher."""
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASHER') or DEFAULT_PASSWORD_HASHER
+    return DEFAULT_PASSWORD_HASHER
 
 
 def hash_password(password: str) -> str:
     """Hash a password."""
-    return generate_password_hash(password)
+    return _get_password_hasher().hash(password)
 
 
 def verify_password(password_hash: str, password: str) -> bool:
-    """Verify a password against its hash."""
-    return check_password_hash(password_hash, password)
+    """
+    Verify a password against its hash.
+    
+    Hashes created before the switch to Argon2 are Werkzeug
+    (pbkdf2/scrypt) hashes and are still accepted.
+    """
+    if not password_hash.startswith(ARGON2_PREFIX):
+        return check_password_hash(password_hash, password)
+    try:
+        return _get_password_hasher().verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
 
+def password_needs_rehash(password_hash: str) -> bool:
+    """Check whether a hash is legacy or uses outdated Argon2 parameters."""
+    if not password_hash.startswith(ARGON2_PREFIX):
+        return True
+    return _get_password_hasher().check_needs_rehash(password_hash)
@@ -0,0 +1,106 @@
+"""SQL expression helpers shared across routes."""
+from datetime import datetime, timedelta
+from functools import wraps
+from sqlalchemy import func, cast, text, Float, Integer, literal_column
+from extensions import db
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_timestamp(column, bucket_minutes: int):
+    """
+    Build a SQL expression that floors a timestamp column to its bucket start.
+
+    On PostgreSQL this uses date_bin() anchored at the Unix epoch, so buckets
+    align to the hour whenever bucket_minutes divides 60. SQLite (used in tests)
+    has no date_bin(), so buckets are computed as integer epoch seconds instead.
+
+    Args:
+        column: Timestamp column to bucket
+        bucket_minutes: Bucket width in minutes
+
+    Returns:
+        SQL expression yielding a timestamp (PostgreSQL) or epoch seconds (SQLite)
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return func.date_bin(
+            func.make_interval(0, 0, 0, 0, 0, bucket_minutes),
+            column,
+            literal_column("TIMESTAMP '1970-01-01'")
+        )
+
+    bucket_seconds = bucket_minutes * 60
+    return cast(func.strftime('%s', column), Integer) // bucket_seconds * bucket_seconds
+
+
+def bucket_to_datetime(value) -> datetime:
+    """
+    Convert a value produced by bucket_timestamp() into a naive datetime.
+
+    Args:
+        value: datetime (PostgreSQL) or epoch seconds (SQLite)
+
+    Returns:
+        Bucket start as datetime
+    """
+    if isinstance(value, datetime):
+        return value
+    return EPOCH + timedelta(seconds=int(value))
+
+
+def no_autoflush(view):
+    """
+    Run a read-only view with session autoflush disabled.
+
+    Queries issued by the view then skip the unit-of-work flush check, which
+    is wasted work when the request never modifies ORM objects.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with db.session.no_autoflush:
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def percent_of_total(count):
+    """
+    Build a SQL expression for a grouped count as a percentage of all groups.
+
+    The denominator is a window sum over every group matched by the query,
+    evaluated before LIMIT, so top-N percentages are relative to the full
+    dataset rather than the returned rows. Cast to float so PostgreSQL
+    returns a double instead of a NUMERIC (Decimal).
+
+    Args:
+        count: Aggregate expression, e.g. func.count()
+
+    Returns:
+        SQL expression yielding a float, or NULL when every count is zero
+    """
+    return cast(100.0 * count / func.nullif(func.sum(count).over(), 0), Float)
+
+
+def estimated_row_count(table_name: str):
+    """
+    Look up the planner's estimate of a table's row count.
+
+    Reading pg_class.reltuples is constant-time, unlike COUNT(*), but is
+    only as fresh as the table's last VACUUM/ANALYZE.
+
+    Args:
+        table_name: Unqualified table name
+
+    Returns:
+        Estimated row count, or None when no estimate is available (the
+        table was never analyzed, or the database isn't PostgreSQL)
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return None
+
+    estimate = db.session.execute(
+        text('SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)'),
+        {'table_name': table_name}
+    ).scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
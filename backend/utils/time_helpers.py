@@ -0,0 +1,34 @@
+"""Timestamp parsing utilities."""
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+# Longest accepted ISO 8601 timestamp (microseconds plus a +HH:MM:SS.ffffff
+# offset); anything longer is rejected without touching the cache
+MAX_ISO_LENGTH = 48
+
+
+def parse_iso_datetime(value: str) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp, returning None if it is malformed.
+    
+    A trailing 'Z' is read as UTC. Results (including rejections) are
+    memoized, since dashboards poll with the same time range repeatedly.
+    
+    Args:
+        value: Value to parse, typically a request argument
+    
+    Returns:
+        Parsed datetime, or None if value is not a valid ISO 8601 timestamp
+    """
+    if not isinstance(value, str) or len(value) > MAX_ISO_LENGTH:
+        return None
+    return _parse_iso_cached(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_cached(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
@@ -0,0 +1,57 @@
+"""UUID parsing utilities."""
+import uuid
+from functools import lru_cache
+from typing import Optional
+from flask import abort, jsonify, make_response
+
+# Longest accepted UUID spelling ('urn:uuid:' + 36 chars); anything longer is
+# rejected without touching the cache
+MAX_UUID_LENGTH = 45
+
+
+def parse_uuid(value: str) -> Optional[uuid.UUID]:
+    """
+    Parse a UUID string, returning None if it is malformed.
+    
+    Results (including rejections) are memoized, since the same file and
+    entry IDs are requested repeatedly.
+    
+    Args:
+        value: Value to parse, typically a request argument
+    
+    Returns:
+        Parsed UUID, or None if value is not a valid UUID
+    """
+    if not isinstance(value, str) or len(value) > MAX_UUID_LENGTH:
+        return None
+    return _parse_uuid_cached(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_uuid_cached(value: str) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+def parse_log_file_id(value: Optional[str]) -> Optional[uuid.UUID]:
+    """
+    Parse an optional log_file_id request argument.
+    
+    Args:
+        value: Raw argument value
+    
+    Returns:
+        Parsed UUID, or None if no log_file_id was given
+    
+    Raises:
+        HTTPException: 400 response if the value is not a valid UUID, rather
+            than falling back to an unfiltered query over every file
+    """
+    if not value:
+        return None
+    file_uuid = parse_uuid(value)
+    if file_uuid is None:
+        abort(make_response(jsonify({'error': 'Invalid log_file_id format'}), 400))
+    return file_uuid
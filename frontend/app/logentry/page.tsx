@@ -56,7 +56,7 @@ export default function LogExplorerPage() {
 
       const response = await logsApi.listLogEntries(params);
       setEntries(response.entries);
-      setTotalEntries(response.total);
+      setTotalEntries(response.total ?? 0);
     } catch (err: any) {
       setError(err.response?.data?.error || 'Failed to load log entries');
       console.error('Error fetching log entries:', err);
@@ -52,6 +52,8 @@ export interface RecentLogEntry {
 
 export interface RecentLogs {
   entries: RecentLogEntry[];
+  next_cursor?: string | null;
+  has_more?: boolean;
 }
 
 export interface LogSummary {
@@ -66,6 +66,7 @@ export interface LogEntry {
 export interface ListLogEntriesParams {
   page?: number;
   limit?: number;
+  cursor?: string;  // next_cursor from the previous page; replaces page
   log_file_id?: string;
   start_time?: string;
   end_time?: string;
@@ -80,9 +81,11 @@ export interface ListLogEntriesParams {
 
 export interface ListLogEntriesResponse {
   entries: LogEntry[];
-  total: number;
-  page: number;
+  total?: number;  // Omitted when paging by cursor
+  page?: number;
   limit: number;
+  next_cursor?: string | null;
+  has_more?: boolean;
 }
 
 export const logsApi = {
@@ -142,9 +145,11 @@ export const logsApi = {
       is_anomalous,
       domain,
       search,
+      cursor,
     } = params;
 
     const queryParams: Record<string, any> = { page, limit };
+    if (cursor) queryParams.cursor = cursor;
     if (log_file_id) queryParams.log_file_id = log_file_id;
     if (start_time) queryParams.start_time = start_time;
     if (end_time) queryParams.end_time = end_time;